@@ -1,44 +1,342 @@
+import codecs
+import importlib.util
+
 import pandas as pd
 import numpy as np
 
+from graph import CoauthorGraph
+from search import SearchIndex, text_hashes
+from similarity import SimilarityIndex
+from sparse import CSRMatrix
+from trends import trend_scores
+
+# meta.csv 的列类型：会议为分类，年份 / id 为紧凑整数，其余为字符串
+# 关键词组合重复较多时才用分类，见 _compact_columns
+CSV_SCHEMA = {
+    'id': 'Int32',
+    'conference': 'category',
+    'year': 'Int16',
+    'title': 'string',
+    'authors': 'string',
+    'abstract': 'string',
+    'keywords': 'string',
+}
+
+
+def detect_encoding(file_path, sample_size=1 << 16):
+    """
+    只读取文件开头一次来猜测编码，避免 utf-8 失败后再完整重读一遍
+    样本之后才出现的非 utf-8 字节判断不出来，load_data 会在解码失败时改用 gbk 重读
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # 增量解码：样本末尾被截断的多字节字符不算错误
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'gbk'
+
+
+def _has_pyarrow():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def memory_footprint(df):
+    """各列内存占用 (字节，含字符串内容) 以及总计"""
+    usage = df.memory_usage(deep=True, index=True)
+    return {'columns': usage.drop('Index', errors='ignore').to_dict(), 'total': int(usage.sum())}
+
+
+class InvertedIndex:
+    """
+    倒排索引：规范化后的值 (去空格 + casefold) -> 论文行号
+    terms 为排序数组，精确匹配与前缀匹配都是二分查找；
+    子串匹配只扫描去重后的词表，而不是全部论文。
+    """
+
+    def __init__(self, long_df, col_name):
+        categories = long_df[col_name].cat.categories
+        normalized = pd.Index(categories.astype(str)).str.strip().str.casefold()
+        term_of_cat, terms = pd.factorize(normalized, sort=True)
+        self.terms = np.asarray(terms, dtype=object)
+
+        # 每个词保留一个原始写法用于展示
+        self.labels = np.empty(len(self.terms), dtype=object)
+        self.labels[term_of_cat[::-1]] = np.asarray(categories, dtype=object)[::-1]
+        self.term_of_cat = term_of_cat
+
+        # 按 (词, 行号) 排序并去重，得到 CSR 形式的 postings
+        term_codes = term_of_cat[long_df[col_name].cat.codes.to_numpy()] if len(long_df) else np.array([], dtype=np.int64)
+        rows = long_df['row'].to_numpy()
+        order = np.lexsort((rows, term_codes))
+        term_codes, rows = term_codes[order], rows[order]
+        keep = np.ones(len(rows), dtype=bool)
+        keep[1:] = (term_codes[1:] != term_codes[:-1]) | (rows[1:] != rows[:-1])
+        term_codes, self.rows = term_codes[keep], rows[keep]
+        self.indptr = np.zeros(len(self.terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_codes, minlength=len(self.terms)), out=self.indptr[1:])
+
+    @staticmethod
+    def normalize(value):
+        return str(value).strip().casefold()
+
+    def _term_range(self, query, match):
+        """返回匹配到的词编码"""
+        key = self.normalize(query)
+        if match == 'exact':
+            i = np.searchsorted(self.terms, key)
+            if i < len(self.terms) and self.terms[i] == key:
+                return np.array([i])
+            return np.array([], dtype=np.int64)
+        if match == 'prefix':
+            lo = np.searchsorted(self.terms, key, side='left')
+            hi = np.searchsorted(self.terms, key + '\U0010ffff', side='left')
+            return np.arange(lo, hi)
+        if match == 'substring':
+            hits = pd.Index(self.terms).str.contains(key, regex=False)
+            return np.flatnonzero(hits)
+        raise ValueError(f"Unknown match mode: {match}")
+
+    def lookup(self, query, match='exact'):
+        """返回包含该值的论文行号 (升序)"""
+        term_ids = self._term_range(query, match)
+        if len(term_ids) == 1:
+            i = term_ids[0]
+            return self.rows[self.indptr[i]:self.indptr[i + 1]]
+        if len(term_ids) == 0:
+            return np.array([], dtype=self.rows.dtype)
+        parts = [self.rows[self.indptr[i]:self.indptr[i + 1]] for i in term_ids]
+        return np.unique(np.concatenate(parts))
+
+    def codes_of(self, query, match='exact'):
+        """返回匹配到的原始类别编码 (大小写不同的写法会被一起返回)"""
+        return np.flatnonzero(np.isin(self.term_of_cat, self._term_range(query, match)))
+
+    def search(self, query, match='prefix'):
+        """返回匹配的原始写法列表，用于搜索框联想"""
+        return self.labels[self._term_range(query, match)].tolist()
+
+
 class PaperAnalyzer:
-    def __init__(self, df):
+    def __init__(self, df, search_index=None, related=None, details=None):
         """
         初始化分析器，传入原始 DataFrame
+        search_index: 采集时保存的 SearchIndex (可选)，与数据不一致时在首次搜索时重建
+        related: 采集时预先计算的相关论文 NeighborTable (可选)，与数据不一致时忽略
+        details: 按行号从磁盘读取 df 中没有的大文本列 (如摘要) 的对象 (见 datasource.CsvRecords)，
+                 看板借此不在内存中保留摘要
+        """
+        # 使用位置索引，长表中的 row 列即为 raw_df 的行号
+        self.raw_df = self._prepare(df)
+        self.details = details
+
+        # 只炸开一次：论文↔关键词、论文↔作者 两张长表 (row, 值)，值为整数编码的 Categorical
+        self.kw_long = self._build_long_table('keywords')
+        self.author_long = self._build_long_table('authors')
+
+        self._build_indexes()
+        ids, text = self._paper_ids(), self._text_columns(self.raw_df, details)
+        # 每篇论文 (标题, 摘要) 的哈希，用于核对全文索引，以及数据源判断文件重写后摘要是否变化
+        self.doc_hashes = text_hashes(*text)
+        self.search_index = search_index if search_index is not None \
+            and search_index.is_fresh(ids, self.doc_hashes) else None
+        # 相关论文还混合了关键词，关键词变化也会使其过期
+        self.related_table = related if related is not None \
+            and related.is_fresh(ids, text_hashes(*text, self._column_values(self.raw_df, 'keywords'))) else None
+        self._similarity = None
+        # 数据版本号，每次增量更新后加一
+        self.version = 0
+
+    @staticmethod
+    def _prepare(df, offset=0):
+        """
+        重置为从 offset 开始的位置索引，并填充 keywords / authors 的空值
+        (load_data 已经填充过；只有存在空值时才替换列，不修改调用方的数据)
         """
-        self.raw_df = df
+        df = df.reset_index(drop=True)
+        if offset:
+            df.index = df.index + offset
         # 预处理：填充空值，防止后续报错
         # 针对你的数据，keywords 可能是空的，这步很重要
-        if 'keywords' in self.raw_df.columns:
-            self.raw_df['keywords'] = self.raw_df['keywords'].fillna('')
-        if 'authors' in self.raw_df.columns:
-            self.raw_df['authors'] = self.raw_df['authors'].fillna('')
+        for col in ('keywords', 'authors'):
+            if col in df.columns and df[col].isna().any():
+                df[col] = df[col].astype(object).fillna('')
+        return df
+
+    def _build_indexes(self):
+        """
+        由 raw_df 与两张长表构建所有派生结构 (只涉及整数编码，不再做字符串处理)
+        """
+        # 年份 / 会议编码为整数，供向量化统计使用
+        self._year_codes, self._years = self._factorize('year')
+        self._conf_codes, self._confs = self._factorize('conference')
+
+        # 论文 × 关键词 / 论文 × 作者 稀疏矩阵 (CSR)，所有计数都是其上的向量化归约
+        self.kw_names = np.asarray(self.kw_long['keywords'].cat.categories, dtype=object)
+        self.author_names = np.asarray(self.author_long['authors'].cat.categories, dtype=object)
+        self.kw_matrix = self._build_matrix(self.kw_long, 'keywords')
+        self.author_matrix = self._build_matrix(self.author_long, 'authors')
+        # 0/1 出现矩阵，用于共现分析
+        self.kw_incidence = self.kw_matrix.binarize()
+
+        # 精确匹配的倒排索引，查询代价只与结果数量相关
+        self.keyword_index = InvertedIndex(self.kw_long, 'keywords')
+        self.author_index = InvertedIndex(self.author_long, 'authors')
+        # 合作者图在第一次用到时才构建
+        self._coauthor_graph = None
+
+        # 聚合立方体：(年份, 会议) 单元格 × 关键词 / 作者 的计数矩阵
+        # 单元格编号 = 年份编码 * (会议数 + 1) + 会议编码，每一维最后一格存放缺失值
+        # 这样年份为 "Unknown" 的论文仍计入不筛选年份的统计
+        # 由论文矩阵汇总只需一次 COO 求和，比从磁盘读取物化的立方体更快，也不会过期
+        n_conf_slots = len(self._confs) + 1
+        self._n_cells = (len(self._years) + 1) * n_conf_slots
+        self._cell_years = np.arange(self._n_cells) // n_conf_slots
+        self._cell_confs = np.arange(self._n_cells) % n_conf_slots
+        self.kw_cube = self._cube_from_matrix(self.kw_matrix)
+        self.author_cube = self._cube_from_matrix(self.author_matrix)
+
+    @staticmethod
+    def _concat(first, second):
+        """拼接两个 DataFrame，分类列合并类别而不是退化为 object"""
+        if first.empty:
+            return second
+        if second.empty:
+            return first
+        merged = pd.concat([first, second])
+        for col in first.columns:
+            if col in second.columns and isinstance(first[col].dtype, pd.CategoricalDtype) \
+                    and isinstance(second[col].dtype, pd.CategoricalDtype):
+                try:
+                    merged[col] = pd.api.types.union_categoricals(
+                        [first[col], second[col]], sort_categories=True)
+                except TypeError:
+                    # 类别的底层类型不同 (如 object 与 Arrow 字符串)
+                    merged[col] = merged[col].astype(object).astype('category')
+        return merged
+
+    def extend(self, new_df):
+        """
+        增量追加新论文：只炸开新行，再由整数编码重建索引与聚合
+        """
+        if new_df.empty:
+            return self
+        new_df = self._prepare(new_df, offset=len(self.raw_df))
+        text = self._text_columns(new_df, self.details)
+        if self.details is not None:
+            # 摘要等大文本列按需从磁盘读取，不并入 raw_df
+            new_df = new_df.drop(columns=list(self.details.columns), errors='ignore')
+        new_kw = self._build_long_table('keywords', new_df)
+        new_authors = self._build_long_table('authors', new_df)
+        self.raw_df = self._concat(self.raw_df, new_df)
+        self.kw_long = self._concat(self.kw_long, new_kw).reset_index(drop=True)
+        self.author_long = self._concat(self.author_long, new_authors).reset_index(drop=True)
+        self._build_indexes()
+        self.doc_hashes = np.concatenate([self.doc_hashes, text_hashes(*text)])
+        if self.search_index is not None:
+            # 返回新的索引对象，不影响仍在使用旧分析器的会话
+            self.search_index = self.search_index.extend(self._paper_ids()[-len(new_df):], *text)
+        # 相似度依赖全部论文的 IDF，新论文加入后在下次查询时重建
+        self.related_table = None
+        self._similarity = None
+        self.version += 1
+        return self
+
+    def update_keywords(self, rows, keywords):
+        """
+        更新部分论文的关键词 (例如关键词生成回写后)，只重新炸开这些行
+        rows: raw_df 行号；keywords: 对应的新关键词字符串
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) == 0:
+            return self
+        was_category = isinstance(self.raw_df['keywords'].dtype, pd.CategoricalDtype)
+        column = self.raw_df['keywords'].astype(object).to_numpy(copy=True)
+        column[rows] = list(keywords)
+        column = pd.Series(column, index=self.raw_df.index).fillna('')
+        self.raw_df = self.raw_df.assign(keywords=column.astype('category') if was_category else column)
+
+        changed = self.raw_df.iloc[rows][['keywords']]
+        keep = ~np.isin(self.kw_long['row'].to_numpy(), rows)
+        self.kw_long = self._concat(
+            self.kw_long[keep], self._build_long_table('keywords', changed)).reset_index(drop=True)
+        self._build_indexes()
+        # 相关论文混合了关键词相似度
+        self.related_table = None
+        self._similarity = None
+        self.version += 1
+        return self
 
     @staticmethod
-    def load_data(file_path=None):
+    def load_data(file_path=None, usecols=None, engine='auto', verbose=True):
         """
         加载数据函数。
+        按 CSV_SCHEMA 读取为紧凑类型；有 pyarrow 时使用 pyarrow 引擎与 Arrow 字符串。
+        usecols: 只读取部分列 (例如看板可以不加载摘要)
         """
         if file_path:
             # --- 真实模式 ---
             try:
-                # pandas 的 read_csv 默认能完美处理你数据中的双引号
-                # 例如 "Kathryn Stolee,Tobias Welp" 会被正确读作一个字符串
-                df = pd.read_csv(file_path, encoding='utf-8')
+                encoding = detect_encoding(file_path)
+                if engine == 'auto':
+                    engine = 'pyarrow' if _has_pyarrow() else 'c'
+                try:
+                    df = PaperAnalyzer.read_csv_typed(file_path, encoding=encoding, engine=engine, usecols=usecols)
+                except UnicodeDecodeError:
+                    if encoding == 'gbk':
+                        raise
+                    # 开头是纯 ASCII、后面才出现 GBK 字节的文件
+                    encoding = 'gbk'
+                    df = PaperAnalyzer.read_csv_typed(file_path, encoding=encoding, engine=engine, usecols=usecols)
+                # 实际使用的编码，增量读取新追加的行时沿用
+                df.attrs['encoding'] = encoding
+                if verbose:
+                    total = memory_footprint(df)['total']
+                    print(f"已加载 {len(df)} 篇论文 (编码 {encoding}, 引擎 {engine})，内存占用 {total / 2**20:.1f} MiB")
                 return df
             except Exception as e:
                 print(f"读取文件失败: {e}")
-                # 尝试使用 gbk 编码，防止中文系统下的编码问题
-                try:
-                    print("尝试使用 gbk 编码读取...")
-                    df = pd.read_csv(file_path, encoding='gbk')
-                    return df
-                except:
-                    return pd.DataFrame()
+                return pd.DataFrame()
         else:
             # --- 模拟模式 (生成符合你格式的数据用于测试) ---
             return pd.DataFrame()
 
+    @staticmethod
+    def read_csv_typed(source, encoding='utf-8', engine='c', usecols=None):
+        """
+        按 CSV_SCHEMA 读取 CSV (路径或文件对象)
+        先把所有列读成字符串，再逐列转换为紧凑类型
+        """
+        # pandas 的 read_csv 默认能完美处理你数据中的双引号
+        # 例如 "Kathryn Stolee,Tobias Welp" 会被正确读作一个字符串
+        string_dtype = pd.StringDtype('pyarrow') if _has_pyarrow() else pd.StringDtype()
+        df = pd.read_csv(source, encoding=encoding, engine=engine, usecols=usecols, dtype=string_dtype)
+        return PaperAnalyzer._compact_columns(df)
+
+    @staticmethod
+    def _compact_columns(df, max_category_ratio=0.5):
+        """
+        按 CSV_SCHEMA 转换列类型，并把 keywords / authors 的空值填为空字符串
+        """
+        for col, dtype in CSV_SCHEMA.items():
+            if col not in df.columns:
+                continue
+            if dtype in ('Int16', 'Int32'):
+                # 例如年份为 "Unknown" 时转为缺失值
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype(dtype)
+            elif dtype == 'category':
+                df[col] = df[col].astype('category')
+            elif col in ('keywords', 'authors'):
+                values = df[col].fillna('')
+                # 重复度高的列 (如关键词组合) 用分类存储更省内存
+                if len(values) and values.nunique() <= max_category_ratio * len(values):
+                    values = values.astype('category')
+                df[col] = values
+        return df
+
     def _explode_column(self, df, col_name):
         """
         内部工具函数：将包含多个值的字符串列炸开成多行
@@ -68,6 +366,146 @@ class PaperAnalyzer:
         # 过滤掉空字符串
         return df_exploded[df_exploded[col_name] != '']
 
+    def _factorize(self, col_name):
+        """将列编码为 (每行的整数编码, 排序后的唯一值)"""
+        if col_name not in self.raw_df.columns:
+            return np.zeros(len(self.raw_df), dtype=np.int32), np.array([])
+        codes, uniques = pd.factorize(self.raw_df[col_name], sort=True)
+        return codes.astype(np.int32), np.asarray(uniques)
+
+    def _build_long_table(self, col_name, df=None):
+        """
+        构建长表：每行一个 (论文行号, 值) 对
+        值列为 Categorical，底层是整数编码，统计时直接对编码计数
+        df 默认为 raw_df，其索引即论文行号
+        """
+        df = self.raw_df if df is None else df
+        if col_name not in df.columns or df.empty:
+            return pd.DataFrame({'row': np.array([], dtype=np.int32),
+                                 col_name: pd.Categorical([])})
+        column = df[col_name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # 分类列只需炸开去重后的类别，再按每行的类别编码展开
+            cats = pd.DataFrame({col_name: column.cat.categories.astype(str)})
+            cat_exploded = self._explode_column(cats, col_name)
+            cat_of_value = cat_exploded.index.to_numpy(dtype=np.int64)
+            value_codes, values = pd.factorize(cat_exploded[col_name].to_numpy(), sort=True)
+            cat_indptr = np.zeros(len(cats) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(cat_of_value, minlength=len(cats)), out=cat_indptr[1:])
+
+            codes = column.cat.codes.to_numpy().astype(np.int64)
+            lengths = np.where(codes >= 0, np.diff(cat_indptr)[codes], 0)
+            offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            positions = np.repeat(cat_indptr[np.maximum(codes, 0)], lengths) + offsets
+            return pd.DataFrame({
+                'row': np.repeat(df.index.to_numpy(dtype=np.int32), lengths),
+                col_name: pd.Categorical.from_codes(value_codes[positions], categories=values),
+            })
+
+        df_exploded = self._explode_column(df[[col_name]], col_name)
+        return pd.DataFrame({
+            'row': df_exploded.index.to_numpy(dtype=np.int32),
+            col_name: pd.Categorical(np.asarray(df_exploded[col_name], dtype=object)),
+        })
+
+    def _row_mask(self, year=None, conference=None):
+        """按年份 / 会议生成行掩码 (None 表示不过滤)"""
+        mask = None
+        if year:
+            mask = self.raw_df['year'].eq(year).fillna(False).to_numpy(dtype=bool)
+        if conference:
+            conf_mask = self.raw_df['conference'].eq(conference).fillna(False).to_numpy(dtype=bool)
+            mask = conf_mask if mask is None else mask & conf_mask
+        return mask
+
+    def _paper_ids(self):
+        """论文 id 数组，缺失 id 时用行号代替，用于核对全文索引是否与数据一致"""
+        if 'id' not in self.raw_df.columns:
+            return np.arange(len(self.raw_df), dtype=np.int64)
+        return self.raw_df['id'].astype('Int64').fillna(-1).to_numpy(dtype=np.int64)
+
+    @staticmethod
+    def _text_columns(df, details=None):
+        """全文索引使用的 (标题, 摘要) 两列"""
+        return tuple(PaperAnalyzer._column_values(df, col, details) for col in ('title', 'abstract'))
+
+    @staticmethod
+    def _column_values(df, col, details=None):
+        """
+        某一列的字符串列表，缺失的列 / 值为空字符串
+        df 中没有、但 details 能提供的列 (看板不常驻的摘要) 按 df 的行号从磁盘读取
+        """
+        if col in df.columns:
+            return df[col].astype(object).fillna('').tolist()
+        if details is not None and col in details.columns:
+            return details.values(df.index.to_numpy(), col)
+        return [''] * len(df)
+
+    def _rows_of(self, df_part):
+        """DataFrame 子集 -> raw_df 中的行号"""
+        return self.raw_df.index.get_indexer(df_part.index)
+
+    def _build_matrix(self, long_df, col_name):
+        """长表 -> 论文 × 值 的 CSR 矩阵，元素为出现次数"""
+        return CSRMatrix.from_coo(
+            long_df['row'].to_numpy(),
+            long_df[col_name].cat.codes.to_numpy(),
+            shape=(len(self.raw_df), len(long_df[col_name].cat.categories)),
+        )
+
+    def _count_values(self, matrix, row_mask=None):
+        """
+        按列计数，返回 (编码数组, 频次数组)，按频次降序
+        row_mask 为 raw_df 上的布尔掩码
+        """
+        counts = matrix.sum(axis=0, row_weights=row_mask)
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0]
+        return order, counts[order]
+
+    def _count_frame(self, matrix, names, row_mask, columns):
+        order, counts = self._count_values(matrix, row_mask)
+        return pd.DataFrame({columns[0]: names[order], columns[1]: counts})
+
+    def _paper_cells(self):
+        """每篇论文所在的 (年份, 会议) 单元格"""
+        return self._cell_of(self._year_codes, self._conf_codes)
+
+    def _cell_of(self, year_codes, conf_codes):
+        """(年份编码, 会议编码) -> 单元格编号，编码 -1 (缺失) 落到最后一格"""
+        year_codes = np.where(year_codes < 0, len(self._years), year_codes)
+        conf_codes = np.where(conf_codes < 0, len(self._confs), conf_codes)
+        return year_codes * (len(self._confs) + 1) + conf_codes
+
+    def _cube_from_matrix(self, matrix):
+        """由论文级矩阵汇总出 单元格 × 值 的计数矩阵"""
+        cells = self._paper_cells()[matrix.row_ids()]
+        return CSRMatrix.from_coo(cells, matrix.indices, matrix.data,
+                                  shape=(self._n_cells, matrix.shape[1]))
+
+    def _cell_mask(self, year=None, conference=None):
+        """按年份 / 会议生成单元格掩码 (None 表示不过滤)"""
+        mask = None
+        if year:
+            mask = np.append(self._years.astype(object), None)[self._cell_years] == year
+        if conference:
+            conf_mask = np.append(self._confs.astype(object), None)[self._cell_confs] == conference
+            mask = conf_mask if mask is None else mask & conf_mask
+        return mask
+
+    def _cube_count_frame(self, cube, names, year, conference, columns):
+        """从立方体读取计数，按频次降序"""
+        return self._count_frame(cube, names, self._cell_mask(year, conference), columns)
+
+    def _year_keyword_matrix(self, conference=None):
+        """
+        年份 × 关键词 频次矩阵 (numpy)，行对应 self._years
+        直接对立方体按年份分组求和，不触碰论文行
+        """
+        year_groups = np.where(self._cell_years < len(self._years), self._cell_years, -1)
+        return self.kw_cube.grouped_sum(year_groups, len(self._years),
+                                        self._cell_mask(conference=conference))
+
     def get_basic_info(self):
         """返回基础统计信息"""
         if self.raw_df.empty:
@@ -77,44 +515,98 @@ class PaperAnalyzer:
             'total_papers': len(self.raw_df),
             'year_range': (self.raw_df['year'].min(), self.raw_df['year'].max()),
             'conferences': self.raw_df['conference'].unique().tolist(),
-            'years': sorted(self.raw_df['year'].unique(), reverse=True)
+            'years': sorted(self.raw_df['year'].dropna().unique().tolist(), reverse=True)
         }
 
     def get_keyword_stats(self, year=None, conference=None, limit=None):
         """
         统计关键词频率
         """
-        df_subset = self.raw_df.copy()
-        if year:
-            df_subset = df_subset[df_subset['year'] == year]
-        if conference:
-            df_subset = df_subset[df_subset['conference'] == conference]
-            
+        row_mask = self._row_mask(year, conference)
+        df_subset = self.raw_df if row_mask is None else self.raw_df[row_mask]
+
         if df_subset.empty:
             return pd.DataFrame(), df_subset
 
-        # 炸开 keywords 列
-        df_exploded = self._explode_column(df_subset, 'keywords')
-        
-        if df_exploded.empty:
+        # 直接读取聚合立方体
+        stats = self._cube_count_frame(self.kw_cube, self.kw_names, year, conference, ['Keyword', 'Count'])
+
+        if stats.empty:
             return pd.DataFrame(columns=['Keyword', 'Count']), df_subset
 
-        # 统计
-        stats = df_exploded['keywords'].value_counts().reset_index()
-        stats.columns = ['Keyword', 'Count']
-        
         if limit:
             stats = stats.head(limit)
             
         return stats, df_subset
 
-    def get_papers_by_keyword_strict(self, keyword, df_scope=None):
+    def _take_rows(self, rows, df_scope=None):
+        """按行号取论文，可选限制在 df_scope 范围内"""
+        if df_scope is not None:
+            rows = np.intersect1d(rows, self._rows_of(df_scope), assume_unique=True)
+        return self.raw_df.iloc[rows]
+
+    def get_papers_by_keyword_strict(self, keyword, df_scope=None, match='exact'):
         """
         查找包含特定关键词的论文
+        match: 'exact' 精确匹配 (忽略大小写)；'prefix' / 'substring' 为显式开启的模糊匹配
         """
-        target_df = df_scope if df_scope is not None else self.raw_df
-        # 模糊匹配
-        return target_df[target_df['keywords'].str.contains(keyword, case=False, na=False)]
+        return self._take_rows(self.keyword_index.lookup(keyword, match), df_scope)
+
+    def get_papers_by_author(self, author_name, df_scope=None, match='exact'):
+        """查找特定作者的论文，match 含义同 get_papers_by_keyword_strict"""
+        return self._take_rows(self.author_index.lookup(author_name, match), df_scope)
+
+    def get_paper_details(self, index, columns=('abstract',)):
+        """
+        按 raw_df 的索引取论文的详细字段 (如摘要)，列表只在用户选中某篇时才取
+        不在内存中的列 (看板不加载摘要) 只读取这几篇论文在文件中的记录
+        """
+        index = list(index)
+        details = self.raw_df.loc[index, [c for c in columns if c in self.raw_df.columns]]
+        on_disk = [c for c in columns if c not in self.raw_df.columns
+                   and self.details is not None and c in self.details.columns]
+        if on_disk:
+            records = self.details.read(self.raw_df.index.get_indexer(index), on_disk)
+            records.index = details.index
+            details = pd.concat([details, records], axis=1)
+            details = details[[c for c in columns if c in details.columns]]
+        return details
+
+    def _search_index(self):
+        """全文索引，缺失或与数据不一致时按当前数据构建"""
+        if self.search_index is None:
+            self.search_index = SearchIndex.build(self._paper_ids(), *self._text_columns(self.raw_df, self.details))
+        return self.search_index
+
+    def search_papers(self, query, top_k=50, year=None, conference=None):
+        """
+        BM25 全文搜索标题与摘要，返回按相关度排序的论文 (附 score 列)
+        只读取查询词的倒排表，不扫描全部摘要
+        """
+        rows, scores = self._search_index().search(query, top_k=top_k,
+                                                doc_mask=self._row_mask(year, conference))
+        return self.raw_df.iloc[rows].assign(score=scores)
+
+    def get_related_papers(self, row, top_k=10):
+        """
+        与第 row 篇论文最相似的论文 (标题 + 摘要的 TF-IDF，混合关键词)，附 similarity 列
+        优先读取采集时预计算的结果，否则在全文索引的倒排表上即时计算
+        """
+        if self.related_table is not None and top_k <= self.related_table.top_k:
+            rows, scores = self.related_table.related(row, top_k)
+        else:
+            if self._similarity is None:
+                self._similarity = SimilarityIndex.from_search_index(self._search_index(), self.kw_incidence)
+            rows, scores = self._similarity.related(row, top_k)
+        return self.raw_df.iloc[rows].assign(similarity=scores)
+
+    def search_keywords(self, query, match='prefix'):
+        """按前缀 / 子串搜索关键词名"""
+        return self.keyword_index.search(query, match)
+
+    def search_authors(self, query, match='prefix'):
+        """按前缀 / 子串搜索作者名"""
+        return self.author_index.search(query, match)
 
     def get_authors_by_keyword(self, keyword):
         """
@@ -125,21 +617,27 @@ class PaperAnalyzer:
         if relevant_papers.empty:
             return pd.DataFrame(), relevant_papers
 
-        # 炸开 authors 列
-        df_exploded = self._explode_column(relevant_papers, 'authors')
-        
-        # 统计 authors 频率
-        stats = df_exploded['authors'].value_counts().reset_index()
-        stats.columns = ['Author', 'Paper_Count']
+        # 在作者长表上只统计相关论文
+        row_mask = np.zeros(len(self.raw_df), dtype=bool)
+        row_mask[self._rows_of(relevant_papers)] = True
+        stats = self._count_frame(self.author_matrix, self.author_names, row_mask, ['Author', 'Paper_Count'])
         
         return stats, relevant_papers
 
-    def get_author_profile(self, author_name):
+    def get_author_stats(self, year=None, conference=None, limit=None):
+        """
+        统计作者发文数 (按年份 / 会议筛选)，直接读取聚合立方体
+        """
+        stats = self._cube_count_frame(self.author_cube, self.author_names, year, conference,
+                                       ['Author', 'Paper_Count'])
+        return stats.head(limit) if limit else stats
+
+    def get_author_profile(self, author_name, match='exact'):
         """
         获取特定作者的所有论文及统计信息
         """
-        # 匹配 authors 列
-        papers = self.raw_df[self.raw_df['authors'].str.contains(author_name, case=False, na=False)]
+        # 通过作者倒排索引查找
+        papers = self.get_papers_by_author(author_name, match=match)
         
         # 统计 conference 分布
         conf_dist = papers['conference'].value_counts().reset_index()
@@ -158,89 +656,119 @@ class PaperAnalyzer:
 
     def get_all_authors_list(self):
         """获取所有不重复的作者列表"""
-        df_exploded = self._explode_column(self.raw_df, 'authors')
-        return sorted(df_exploded['authors'].unique().tolist())
+        # Categorical 的类别本身就是排序后的去重作者
+        return self.author_names.tolist()
 
     def get_all_keywords_list(self):
         """获取所有不重复的关键词列表"""
-        df_exploded = self._explode_column(self.raw_df, 'keywords')
-        return df_exploded['keywords'].value_counts().index.tolist()
+        order, _ = self._count_values(self.kw_cube)
+        return self.kw_names[order].tolist()
     
 
-    def get_keyword_trend_data(self, conference=None, top_n=20):
+    def get_keyword_trend_data(self, conference=None, top_n=20, keywords=None):
         """
         获取关键词随时间变化的趋势数据（用于画折线图）
         逻辑：
         1. 筛选会议（可选）。
-        2. 统计所有年份中，出现总频次最高的 Top N 个关键词。
+        2. 统计所有年份中，出现总频次最高的 Top N 个关键词 (或使用指定的 keywords)。
         3. 返回这些关键词在每一年的具体频次数据。
         """
-        df_subset = self.raw_df.copy()
-        if conference:
-            df_subset = df_subset[df_subset['conference'] == conference]
-        
-        if df_subset.empty:
+        if self.raw_df.empty or (conference and not (self._confs == conference).any()):
             return pd.DataFrame()
 
-        # 1. 炸开关键词
-        df_exploded = self._explode_column(df_subset, 'keywords')
+        # 1. 年份 × 关键词 频次矩阵
+        matrix = self._year_keyword_matrix(conference)
         
         # 2. 找出全时段最热的 Top N 关键词
-        global_top = df_exploded['keywords'].value_counts().head(top_n).index.tolist()
-        
-        # 3. 统计每一年这些关键词的频率
-        # 过滤只保留 Top N 关键词
-        df_filtered = df_exploded[df_exploded['keywords'].isin(global_top)]
-        
-        # 按年份和关键词分组统计
-        trend_data = df_filtered.groupby(['year', 'keywords']).size().reset_index(name='Count')
+        totals = matrix.sum(axis=0)
+        if keywords is not None:
+            global_top = np.flatnonzero(np.isin(self.kw_names, list(keywords)))
+        else:
+            global_top = np.argsort(-totals, kind='stable')[:top_n]
+        global_top = global_top[totals[global_top] > 0]
         
-        # 补全数据：确保每个关键词在每一年都有记录（没有的填0），以便画图连续
-        # Pivot table: Index=Year, Columns=Keywords, Values=Count
-        pivot_df = trend_data.pivot(index='year', columns='keywords', values='Count').fillna(0)
+        # 3. 只保留出现过 Top N 关键词的年份，补全缺失为 0，以便画图连续
+        sub = matrix[:, global_top]
+        year_idx = np.flatnonzero(sub.sum(axis=1) > 0)
+        sub = sub[year_idx]
         
-        # 还原为长格式 (Melt) 以便 Plotly 使用
-        trend_final = pivot_df.reset_index().melt(id_vars='year', var_name='Keyword', value_name='Count')
+        # 长格式 (year, Keyword, Count) 以便 Plotly 使用
+        trend_final = pd.DataFrame({
+            'year': np.tile(self._years[year_idx], len(global_top)),
+            'Keyword': np.repeat(self.kw_names[global_top], len(year_idx)),
+            'Count': sub.T.ravel(),
+        })
         
         return trend_final
 
+    def get_emerging_keywords(self, conference=None, year=None, window=2, min_count=3,
+                              direction='rising', sort_by='burst', limit=20):
+        """
+        新兴 / 衰退主题：对全部关键词同时计算同比增长、z 值、爆发度与斜率 (见 trends.trend_scores)
+        year: 目标年份 (默认最近一年)；window: 近期窗口年数；min_count: 全时段最少出现次数
+        direction: 'rising' 取指标为正且最高的，'declining' 取指标为负且最低的
+        sort_by: 'burst' / 'z_score' / 'growth' / 'slope'
+        """
+        columns = ['Keyword', 'Count', 'Prev_Count', 'Growth', 'Z_Score', 'Burst', 'Slope']
+        if self.raw_df.empty or (conference and not (self._confs == conference).any()):
+            return pd.DataFrame(columns=columns)
+        matrix = self._year_keyword_matrix(conference)
+        # 每年的论文数，按会议筛选；年份缺失 (编码 -1) 的论文不计
+        row_mask = self._row_mask(conference=conference)
+        codes = self._year_codes if row_mask is None else self._year_codes[row_mask]
+        papers = np.bincount(codes[codes >= 0], minlength=len(self._years))
+        years = papers > 0
+        if year:
+            years &= self._years <= year
+        if np.count_nonzero(years) < 2:
+            return pd.DataFrame(columns=columns)
+
+        matrix = matrix[years]
+        scores = trend_scores(matrix, papers[years], window=window, years=self._years[years])
+        candidates = np.flatnonzero(matrix.sum(axis=0) >= min_count)
+        if direction == 'declining':
+            # 衰退主题必须在近期之前出现过
+            candidates = candidates[matrix[:-1, candidates].sum(axis=0) > 0]
+        metric = scores[sort_by][candidates]
+        # 只保留指标方向一致的关键词，同一个词不会同时出现在新兴和衰退两个列表中
+        keep = metric < 0 if direction == 'declining' else metric > 0
+        candidates, metric = candidates[keep], metric[keep]
+        order = np.lexsort((candidates, metric if direction == 'declining' else -metric))[:limit]
+        top = candidates[order]
+        return pd.DataFrame({
+            'Keyword': self.kw_names[top],
+            'Count': scores['count'][top],
+            'Prev_Count': scores['prev_count'][top],
+            'Growth': np.round(scores['growth'][top] * 100, 1),
+            'Z_Score': np.round(scores['z_score'][top], 2),
+            'Burst': np.round(scores['burst'][top], 2),
+            'Slope': np.round(scores['slope'][top], 3),
+        })
+
     def get_yearly_top_k_matrix(self, conference=None, k=20):
         """
         生成一个“年度排名矩阵”表格
         列是年份，行是排名(1~k)，单元格内容是 "关键词 (频次)"
         用于直观对比每年的榜单变化
         """
-        df_subset = self.raw_df.copy()
-        if conference:
-            df_subset = df_subset[df_subset['conference'] == conference]
-            
-        if df_subset.empty:
+        if self.raw_df.empty or (conference and not (self._confs == conference).any()):
             return pd.DataFrame()
 
-        df_exploded = self._explode_column(df_subset, 'keywords')
+        matrix = self._year_keyword_matrix(conference)
         
-        # 按年份分组处理
-        years = sorted(df_exploded['year'].unique(), reverse=True)
+        # 按年份倒序处理，只保留有关键词的年份
         result_dict = {}
-        
-        for year in years:
-            # 获取该年的数据
-            df_year = df_exploded[df_exploded['year'] == year]
-            # 统计并排序
-            top_k = df_year['keywords'].value_counts().head(k).reset_index()
-            top_k.columns = ['Keyword', 'Count']
+        for year_idx in np.flatnonzero(matrix.sum(axis=1) > 0)[::-1]:
+            counts = matrix[year_idx]
+            top_k = np.argsort(-counts, kind='stable')[:k]
+            top_k = top_k[counts[top_k] > 0]
             
             # 格式化显示文本: "Deep Learning (45)"
-            # 如果不足 k 个，用空字符串填充
-            col_data = []
-            for i in range(k):
-                if i < len(top_k):
-                    row = top_k.iloc[i]
-                    col_data.append(f"{row['Keyword']} ({row['Count']})")
-                else:
-                    col_data.append("-")
+            # 如果不足 k 个，用 "-" 填充
+            col_data = [f"{self.kw_names[c]} ({counts[c]})" for c in top_k]
+            col_data += ["-"] * (k - len(col_data))
             
-            result_dict[year] = col_data
+            result_dict[self._years[year_idx]] = col_data
             
         # 生成 DataFrame，索引是排名 1~k
         rank_df = pd.DataFrame(result_dict)
@@ -259,12 +787,19 @@ class PaperAnalyzer:
         if author_papers.empty:
             return pd.DataFrame(), pd.DataFrame()
             
-        # 1. 炸开关键词
-        df_exploded = self._explode_column(author_papers, 'keywords')
+        # 1. 从关键词长表中取出该作者的论文
+        row_mask = np.zeros(len(self.raw_df), dtype=bool)
+        row_mask[self._rows_of(author_papers)] = True
+        kw_part = self.kw_long[row_mask[self.kw_long['row'].to_numpy()]]
         
-        if df_exploded.empty:
+        if kw_part.empty:
             return pd.DataFrame(), pd.DataFrame()
 
+        df_exploded = pd.DataFrame({
+            'year': self.raw_df['year'].to_numpy()[kw_part['row'].to_numpy()],
+            'keywords': kw_part['keywords'].astype(str).to_numpy(),
+        })
+
         # 2. 统计总频次 (列名设为 Keyword)
         kw_counts = df_exploded['keywords'].value_counts().reset_index()
         kw_counts.columns = ['Keyword', 'Count']
@@ -278,4 +813,181 @@ class PaperAnalyzer:
         # 4. 合并 (现在两边都有 Keyword 列了)
         kw_trend = pd.merge(kw_trend, kw_counts, on='Keyword', suffixes=('_Year', '_Total'))
         
-        return kw_counts, kw_trend
\ No newline at end of file
+        return kw_counts, kw_trend
+
+    def _kw_incidence_in(self, row_mask=None):
+        """限定范围内的 论文 × 关键词 0/1 矩阵"""
+        if row_mask is None:
+            return self.kw_incidence
+        return self.kw_incidence.select_rows(row_mask)
+
+    def get_keyword_cooccurrence(self, top_n=30, year=None, conference=None):
+        """
+        关键词共现矩阵：Top N 关键词两两同时出现在同一篇论文中的次数
+        由稀疏矩阵乘积 X^T X 得到，对角线为关键词自身的论文数
+        """
+        row_mask = self._row_mask(year, conference)
+        order, _ = self._count_values(self.kw_cube, self._cell_mask(year, conference))
+        top = order[:top_n]
+        if len(top) == 0:
+            return pd.DataFrame()
+        x = self._kw_incidence_in(row_mask).select_columns(top)
+        co = (x.T @ x).to_dense()
+        names = self.kw_names[top]
+        return pd.DataFrame(co, index=names, columns=names)
+
+    def get_top_keyword_pairs(self, limit=50, year=None, conference=None):
+        """
+        全部关键词中共现次数最多的关键词对
+        返回列: Keyword_A, Keyword_B, Count, Jaccard
+        """
+        x = self._kw_incidence_in(self._row_mask(year, conference))
+        co = x.T @ x
+        rows, cols = co.row_ids(), co.indices
+        freq = x.sum(axis=0)
+        upper = rows < cols
+        rows, cols, counts = rows[upper], cols[upper], co.data[upper]
+        top = np.argsort(-counts, kind='stable')[:limit]
+        rows, cols, counts = rows[top], cols[top], counts[top]
+        return pd.DataFrame({
+            'Keyword_A': self.kw_names[rows],
+            'Keyword_B': self.kw_names[cols],
+            'Count': counts,
+            'Jaccard': (counts / (freq[rows] + freq[cols] - counts)).round(4),
+        })
+
+    def get_associated_keywords(self, keyword, top_k=20, metric='count', year=None, conference=None):
+        """
+        与关键词 X 关联最强的关键词
+        metric: 'count' 共现次数 / 'jaccard' 交并比 / 'lift' 提升度
+        """
+        row_mask = self._row_mask(year, conference)
+        target = np.zeros(len(self.raw_df), dtype=bool)
+        target[self.keyword_index.lookup(keyword)] = True
+        if row_mask is not None:
+            target &= row_mask
+        n_target = int(target.sum())
+        if n_target == 0:
+            return pd.DataFrame(columns=['Keyword', 'Count', 'Jaccard', 'Lift'])
+
+        # 一次矩阵-向量乘积得到所有关键词与 X 的共现次数
+        co = self.kw_incidence.sum(axis=0, row_weights=target)
+        freq = self.kw_incidence.sum(axis=0, row_weights=row_mask)
+        n_total = len(self.raw_df) if row_mask is None else int(row_mask.sum())
+        co[self.keyword_index.codes_of(keyword)] = 0
+
+        candidates = np.flatnonzero(co > 0)
+        co, freq = co[candidates], freq[candidates]
+        result = pd.DataFrame({
+            'Keyword': self.kw_names[candidates],
+            'Count': co,
+            'Jaccard': (co / (n_target + freq - co)).round(4),
+            'Lift': (co * n_total / (n_target * freq)).round(4),
+        })
+        sort_col = {'count': 'Count', 'jaccard': 'Jaccard', 'lift': 'Lift'}[metric]
+        return result.sort_values([sort_col, 'Count'], ascending=False, kind='stable').head(top_k).reset_index(drop=True)
+
+    def get_topic_network(self, top_n=40, min_weight=2, year=None, conference=None):
+        """
+        主题网络：节点为 Top N 关键词，边为共现次数 >= min_weight 的关键词对
+        返回 (nodes, edges) 两个 DataFrame
+        """
+        co = self.get_keyword_cooccurrence(top_n=top_n, year=year, conference=conference)
+        if co.empty:
+            return pd.DataFrame(columns=['Keyword', 'Count']), pd.DataFrame(columns=['Source', 'Target', 'Weight'])
+        values = co.to_numpy()
+        nodes = pd.DataFrame({'Keyword': co.index, 'Count': np.diag(values)})
+        src, dst = np.nonzero(np.triu(values, k=1) >= max(min_weight, 1))
+        edges = pd.DataFrame({
+            'Source': co.index[src],
+            'Target': co.index[dst],
+            'Weight': values[src, dst],
+        })
+        return nodes, edges
+
+    # ==========================================
+    # 合作者图
+    # ==========================================
+    @property
+    def coauthor_graph(self):
+        """全部论文的合作者图 (作者编码与 author_names 一致)"""
+        if self._coauthor_graph is None:
+            self._coauthor_graph = CoauthorGraph.from_papers(self.author_matrix)
+        return self._coauthor_graph
+
+    def get_top_collaborators(self, author_name, limit=20):
+        """作者合作最多的合作者及合作论文数"""
+        nodes = self.author_index.codes_of(author_name)
+        if not len(nodes):
+            return pd.DataFrame(columns=['Collaborator', 'Joint_Papers'])
+        found, counts = self.coauthor_graph.collaborators(nodes)
+        return pd.DataFrame({'Collaborator': self.author_names[found[:limit]], 'Joint_Papers': counts[:limit]})
+
+    def get_author_neighborhood(self, author_name, hops=2, max_nodes=200):
+        """
+        作者的 k 跳合作网络
+        返回 (nodes, edges)：nodes 含 Author / Hop / Papers，edges 含 Source / Target / Weight
+        超过 max_nodes 时保留跳数小、发文多的作者
+        """
+        graph = self.coauthor_graph
+        nodes, hop = graph.k_hop(self.author_index.codes_of(author_name), hops=hops)
+        papers = graph.paper_counts[nodes]
+        order = np.lexsort((-papers, hop))[:max_nodes]
+        nodes, hop, papers = nodes[order], hop[order], papers[order]
+        src, dst, weights = graph.subgraph_edges(nodes)
+        return (
+            pd.DataFrame({'Author': self.author_names[nodes], 'Hop': hop, 'Papers': papers}),
+            pd.DataFrame({'Source': self.author_names[src], 'Target': self.author_names[dst], 'Weight': weights}),
+        )
+
+    def get_keyword_communities(self, keyword, min_size=2, top_authors=5):
+        """
+        某关键词下的合作社区：只用含该关键词的论文建图，再求连通分量
+        返回每个社区的人数、论文数与发文最多的几位作者
+        """
+        columns = ['Community', 'Size', 'Papers', 'Top_Authors']
+        rows = self.keyword_index.lookup(keyword)
+        if not len(rows):
+            return pd.DataFrame(columns=columns)
+        graph = CoauthorGraph.from_papers(self.author_matrix, rows)
+        labels = graph.components()
+        members = np.flatnonzero(graph.paper_counts)
+        sizes = np.bincount(labels[members], minlength=graph.n_nodes)
+        # 一篇论文的作者必在同一社区，按其任意一位作者归类
+        has_author = np.diff(self.author_matrix.indptr)[rows] > 0
+        any_author = self.author_matrix.indices[self.author_matrix.indptr[rows[has_author]]]
+        papers = np.bincount(labels[any_author], minlength=graph.n_nodes)
+
+        communities = np.flatnonzero(sizes >= min_size)
+        communities = communities[np.lexsort((-papers[communities], -sizes[communities]))]
+        # 社区内按发文数排序，取前几位作者的名字
+        member_order = members[np.lexsort((-graph.paper_counts[members], labels[members]))]
+        member_labels = labels[member_order]
+        rank = np.arange(len(member_order)) - np.searchsorted(member_labels, member_labels)
+        top = rank < top_authors
+        names = pd.Series(self.author_names[member_order[top]]).groupby(member_labels[top]).agg(', '.join)
+        return pd.DataFrame({
+            'Community': np.arange(1, len(communities) + 1),
+            'Size': sizes[communities],
+            'Papers': papers[communities],
+            'Top_Authors': names.reindex(communities).to_numpy(),
+        })
+
+    def get_central_authors(self, year=None, conference=None, metric='pagerank', limit=20):
+        """
+        合作网络中最核心的作者 (可按年份 / 会议筛选论文后建图)
+        metric: 'pagerank' 或 'degree' (合作者人数)
+        """
+        row_mask = self._row_mask(year, conference)
+        graph = self.coauthor_graph if row_mask is None else \
+            CoauthorGraph.from_papers(self.author_matrix, np.flatnonzero(row_mask))
+        degree = graph.degree()
+        score = graph.pagerank() if metric == 'pagerank' else degree.astype(np.float64)
+        active = np.flatnonzero(graph.paper_counts)
+        top = active[np.lexsort((active, -score[active]))][:limit]
+        return pd.DataFrame({
+            'Author': self.author_names[top],
+            'Collaborators': degree[top],
+            'Papers': graph.paper_counts[top],
+            'Score': np.round(score[top], 6),
+        })
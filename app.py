@@ -1,24 +1,43 @@
+import numpy as np
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
-from analysis import PaperAnalyzer
+from analysis import memory_footprint
+from components import SEARCH_SORT_OPTIONS, render_paper_list
+from datasource import DataSource
+from query_cache import CachedAnalyzer, QueryCache
 
 # ==========================================
 # 0. 页面配置与数据加载
 # ==========================================
 st.set_page_config(page_title="学术论文数据分析看板", layout="wide", page_icon="📊")
 
-@st.cache_data
-def load_data_cached():
-    # TODO: 请在这里将 path 替换为你的真实 CSV 文件路径
-    path = 'meta.csv'  # 例如 "data/my_papers.csv"
-    df = PaperAnalyzer.load_data(path)
-    return df
+# TODO: 请在这里将 path 替换为你的真实 CSV 文件路径
+DATA_PATH = 'meta.csv'  # 例如 "data/my_papers.csv"
+
+@st.cache_resource
+def get_data_source():
+    # 所有会话共享同一个数据源；文件变化时只增量加载新增 / 变化的论文
+    return DataSource(DATA_PATH)
+
+# 查询结果缓存的内存上限
+QUERY_CACHE_BYTES = 256 * 2**20
+
+@st.cache_resource
+def get_query_cache():
+    # 跨会话共享的查询结果 LRU 缓存，键中带数据版本，数据更新后旧结果自然淘汰
+    return QueryCache(max_bytes=QUERY_CACHE_BYTES)
 
 # 初始化
 try:
-    df_raw = load_data_cached()
-    analyzer = PaperAnalyzer(df_raw)
+    data_source = get_data_source()
+    # 每次重跑只检查文件的 mtime / 大小，未变化时直接复用分析器
+    raw_analyzer, data_version = data_source.snapshot()
+    query_cache = get_query_cache()
+    # 相同 (方法, 参数, 数据版本) 的查询直接返回缓存结果，不再重复计算
+    analyzer = CachedAnalyzer(raw_analyzer, query_cache, data_version)
+    df_raw = analyzer.raw_df
     basic_info = analyzer.get_basic_info()
     all_unique_kws = analyzer.get_all_keywords_list()
 except Exception as e:
@@ -34,6 +53,13 @@ with st.sidebar:
     st.info(f"⏳ 年份范围: {basic_info['year_range'][0]} - {basic_info['year_range'][1]}")
     st.info(f"🏛️ 涵盖会议: {len(basic_info['conferences'])} 个")
     st.info(f"🔑 关键词总数: {len(all_unique_kws)} 个")
+    st.caption(f"💾 数据内存占用: {memory_footprint(df_raw)['total'] / 2**20:.1f} MiB")
+    st.caption(f"🔄 数据版本: v{data_version}")
+    st.caption(f"🗂️ 查询缓存: {len(query_cache)} 条 / {query_cache.total_bytes / 2**20:.1f} MiB, "
+               f"命中 {query_cache.hits} 次")
+    if st.button("检查数据更新"):
+        # 点击即触发重跑，重跑时 refresh() 会载入新增的论文
+        st.rerun()
     
     st.markdown("---")
     if st.checkbox("显示所有关键词列表"):
@@ -45,12 +71,15 @@ st.title("📚 学术论文多维数据分析看板")
 # ==========================================
 # 2. 核心功能区
 # ==========================================
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
+tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
     "📅 年度关键词热度", 
     "🏛️ 会议关键词分析", 
     "👥 关键词下的作者", 
     "👤 作者投稿画像",
-    "📈 关键词趋势分析" 
+    "📈 关键词趋势分析",
+    "🕸️ 主题网络",
+    "🔍 全文搜索",
+    "🤝 合作网络"
 ])
 
 # --- 功能 1: 年度关键词 ---
@@ -80,10 +109,8 @@ with tab1:
             if target_kw:
                 papers = analyzer.get_papers_by_keyword_strict(target_kw, df_scope=df_year_scope)
                 st.write(f"关于 **{target_kw}** 的论文 ({len(papers)}篇):")
-                for _, row in papers.iterrows():
-                    with st.expander(f"{row['title']}"):
-                        st.caption(f"Authors: {row['authors']}")
-                        st.write(row['abstract'])
+                render_paper_list(papers, key="t1_papers", fetch_details=analyzer.get_paper_details,
+                                  fetch_related=analyzer.get_related_papers)
     else:
         st.warning("该年份暂无数据。")
 
@@ -101,7 +128,8 @@ with tab2:
     
     if not kw_stats_conf.empty:
         total_counts = kw_stats_conf['Count'].sum()
-        kw_stats_conf['Percentage'] = (kw_stats_conf['Count'] / total_counts * 100).round(2)
+        # 缓存的结果在会话间共享，不能原地加列
+        kw_stats_conf = kw_stats_conf.assign(Percentage=(kw_stats_conf['Count'] / total_counts * 100).round(2))
         kw_stats_conf['Percentage_Str'] = kw_stats_conf['Percentage'].astype(str) + '%'
 
         st.write(f"**📊 {sel_conf} {sel_year_conf} Top 20 关键词排名**")
@@ -134,15 +162,8 @@ with tab2:
         if t_kw:
             papers = analyzer.get_papers_by_keyword_strict(t_kw, df_scope=df_conf_scope)
             st.write(f"找到 {len(papers)} 篇包含 **{t_kw}** 的论文：")
-            for i, row in papers.iterrows():
-                expander_title = f"📄 {row['title']}"
-                with st.expander(expander_title):
-                    st.markdown(f"**Title:** {row['title']}")
-                    st.markdown(f"**👥 Authors:** {row['authors']}")
-                    st.markdown(f"**🏷️ Keywords:** {row['keywords']}")
-                    st.markdown("---")
-                    st.markdown(f"**📝 Abstract:**")
-                    st.write(row['abstract'])
+            render_paper_list(papers, key="t2_papers", fetch_details=analyzer.get_paper_details,
+                              fetch_related=analyzer.get_related_papers)
     else:
         st.info("该筛选组合下无数据。")
 
@@ -161,20 +182,28 @@ with tab3:
                 st.plotly_chart(fig, use_container_width=True)
             with c_list:
                 st.write("**详细列表**")
-                for idx, row in auth_stats.head(20).iterrows():
-                    auth_name = row['Author']
-                    p_list = relevant_papers[relevant_papers['authors'].str.contains(auth_name, regex=False)]
-                    with st.expander(f"🏅 {idx+1}. {auth_name} ({row['Paper_Count']} 篇)"):
-                        for _, p in p_list.iterrows():
-                            st.markdown(f"**{p['title']}**")
-                            st.info(f"📅 {p['year']} | 🏛️ {p['conference']} | 🏷️ {p['keywords']}")
-                            st.markdown("---")
+                st.dataframe(auth_stats.head(20), hide_index=True, use_container_width=True)
+
+            # 只展开一位作者的论文，而不是为每位作者都渲染完整列表
+            auth_name = st.selectbox("查看作者在该领域的论文:", auth_stats['Author'].tolist(),
+                                     key="t3_author")
+            if auth_name:
+                p_list = analyzer.get_papers_by_author(auth_name, df_scope=relevant_papers)
+                render_paper_list(p_list, key="t3_papers", fetch_details=analyzer.get_paper_details,
+                                  fetch_related=analyzer.get_related_papers,
+                                  columns=['title', 'year', 'conference', 'keywords'])
 
 # --- 功能 4: 作者画像 (升级版) ---
 with tab4:
     st.subheader("4. 作者投稿画像分析")
     
-    all_authors = analyzer.get_all_authors_list()
+    author_query = st.text_input("按姓名筛选作者 (前缀匹配，留空显示全部)", key="t4_query")
+    if author_query:
+        all_authors = analyzer.search_authors(author_query, match='prefix')
+        if not all_authors:
+            all_authors = analyzer.search_authors(author_query, match='substring')
+    else:
+        all_authors = analyzer.get_all_authors_list()
     sel_author = st.selectbox("搜索作者", all_authors)
     
     if sel_author:
@@ -237,13 +266,8 @@ with tab4:
                 
         st.markdown("---")
         st.markdown("### 📄 详细论文清单")
-        for i, row in auth_papers.iterrows():
-            label = f"[{row['year']}] [{row['conference']}] {row['title']}"
-            with st.expander(label):
-                st.markdown(f"**🏷️ Keywords:** {row['keywords']}")
-                st.markdown(f"**👥 Authors:** {row['authors']}")
-                st.markdown("**📝 Abstract:**")
-                st.write(row['abstract'])
+        render_paper_list(auth_papers, key="t4_papers", fetch_details=analyzer.get_paper_details,
+                          fetch_related=analyzer.get_related_papers)
 
 # --- 功能 5: 趋势分析 ---
 with tab5:
@@ -281,4 +305,221 @@ with tab5:
             
         st.markdown(f"### 📋 {sel_trend_conf} 历年 Top 20 榜单对比")
         rank_matrix_conf = analyzer.get_yearly_top_k_matrix(conference=sel_trend_conf, k=20)
-        st.dataframe(rank_matrix_conf, use_container_width=True)
\ No newline at end of file
+        st.dataframe(rank_matrix_conf, use_container_width=True)
+
+    # 新兴 / 衰退主题：对全部关键词计算，不只看总量 Top N
+    st.markdown("---")
+    emerging_conf = None if trend_type == "🌍 全局年度趋势 (所有会议)" else sel_trend_conf
+    st.markdown(f"### 🚀 增长最快 / 衰退最快的主题 ({emerging_conf or '所有会议'})")
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        emerging_metric = st.selectbox(
+            "排序指标", ["burst", "z_score", "growth", "slope"], key="t5_metric",
+            format_func={"burst": "爆发度 (近期 vs 基线)", "z_score": "Z 值 (相对历年波动)",
+                         "growth": "同比增长率", "slope": "线性趋势斜率"}.get)
+    with c2:
+        emerging_window = st.slider("近期窗口 (年)", 1, 5, 2, key="t5_window")
+    with c3:
+        emerging_min = st.slider("最少出现次数", 1, 50, 5, key="t5_min")
+
+    rising = analyzer.get_emerging_keywords(conference=emerging_conf, window=emerging_window,
+                                            min_count=emerging_min, direction='rising',
+                                            sort_by=emerging_metric, limit=20)
+    declining = analyzer.get_emerging_keywords(conference=emerging_conf, window=emerging_window,
+                                               min_count=emerging_min, direction='declining',
+                                               sort_by=emerging_metric, limit=20)
+    c_up, c_down = st.columns(2)
+    with c_up:
+        st.write("**📈 上升最快**")
+        st.dataframe(rising, hide_index=True, use_container_width=True)
+    with c_down:
+        st.write("**📉 下降最快**")
+        st.dataframe(declining, hide_index=True, use_container_width=True)
+
+    if not rising.empty:
+        rising_trend = analyzer.get_keyword_trend_data(conference=emerging_conf,
+                                                       keywords=rising['Keyword'].head(8).tolist())
+        fig_rising = px.line(rising_trend, x='year', y='Count', color='Keyword', markers=True,
+                             title='上升最快的主题历年频次')
+        fig_rising.update_layout(hovermode="x unified")
+        st.plotly_chart(fig_rising, use_container_width=True)
+
+# --- 功能 6: 主题网络 (关键词共现) ---
+with tab6:
+    st.subheader("🕸️ 关键词共现与主题网络")
+
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        net_conf = st.selectbox("会议", ["全部"] + basic_info['conferences'], key="t6_conf")
+    with c2:
+        net_year = st.selectbox("年份", ["全部"] + list(basic_info['years']), key="t6_year")
+    with c3:
+        net_top_n = st.slider("节点数 (Top N 关键词)", 10, 150, 50, key="t6_top")
+    with c4:
+        net_min_weight = st.slider("最小共现次数", 1, 50, 3, key="t6_weight")
+    net_conf = None if net_conf == "全部" else net_conf
+    net_year = None if net_year == "全部" else net_year
+
+    nodes, edges = analyzer.get_topic_network(top_n=net_top_n, min_weight=net_min_weight,
+                                              year=net_year, conference=net_conf)
+    if not nodes.empty:
+        # 圆形布局：按频次排序后均匀分布在圆周上
+        angles = np.linspace(0, 2 * np.pi, len(nodes), endpoint=False)
+        pos = {kw: (np.cos(a), np.sin(a)) for kw, a in zip(nodes['Keyword'], angles)}
+        edge_x, edge_y = [], []
+        for src, dst in zip(edges['Source'], edges['Target']):
+            edge_x += [pos[src][0], pos[dst][0], None]
+            edge_y += [pos[src][1], pos[dst][1], None]
+        max_count = nodes['Count'].max()
+        fig_net = go.Figure([
+            go.Scatter(x=edge_x, y=edge_y, mode='lines', hoverinfo='none',
+                       line=dict(width=0.6, color='#bbbbbb')),
+            go.Scatter(x=[pos[k][0] for k in nodes['Keyword']], y=[pos[k][1] for k in nodes['Keyword']],
+                       mode='markers+text', text=nodes['Keyword'], textposition='top center',
+                       hovertext=[f"{k}: {c} 篇" for k, c in zip(nodes['Keyword'], nodes['Count'])],
+                       hoverinfo='text',
+                       marker=dict(size=10 + 30 * nodes['Count'] / max_count, color=nodes['Count'],
+                                   colorscale='Viridis', showscale=True)),
+        ])
+        fig_net.update_layout(showlegend=False, height=700,
+                              xaxis=dict(visible=False), yaxis=dict(visible=False, scaleanchor='x'))
+        st.plotly_chart(fig_net, use_container_width=True)
+
+        st.markdown("### 🔥 共现热力图 (Top 20)")
+        co_matrix = analyzer.get_keyword_cooccurrence(top_n=20, year=net_year, conference=net_conf)
+        st.plotly_chart(px.imshow(co_matrix, color_continuous_scale='Blues', aspect='auto'),
+                        use_container_width=True)
+
+        st.markdown("### 🔗 共现最多的关键词对")
+        st.dataframe(analyzer.get_top_keyword_pairs(limit=50, year=net_year, conference=net_conf),
+                     use_container_width=True)
+    else:
+        st.info("该筛选组合下无关键词数据。")
+
+    st.markdown("---")
+    st.markdown("### 🧲 与某关键词最相关的关键词")
+    a1, a2 = st.columns([2, 1])
+    with a1:
+        assoc_kw = st.selectbox("选择关键词", all_unique_kws, key="t6_assoc_kw")
+    with a2:
+        assoc_metric = st.radio("排序指标", ["count", "jaccard", "lift"], horizontal=True, key="t6_metric")
+    if assoc_kw:
+        assoc = analyzer.get_associated_keywords(assoc_kw, top_k=20, metric=assoc_metric,
+                                                 year=net_year, conference=net_conf)
+        if not assoc.empty:
+            sort_col = {'count': 'Count', 'jaccard': 'Jaccard', 'lift': 'Lift'}[assoc_metric]
+            fig_assoc = px.bar(assoc, x=sort_col, y='Keyword', orientation='h', color=sort_col,
+                               hover_data=['Count', 'Jaccard', 'Lift'])
+            fig_assoc.update_layout(yaxis={'categoryorder': 'total ascending'})
+            st.plotly_chart(fig_assoc, use_container_width=True)
+        else:
+            st.info("该关键词在当前筛选下没有共现关键词。")
+
+# --- 功能 7: 全文搜索 (标题 + 摘要，BM25) ---
+with tab7:
+    st.subheader("🔍 论文全文搜索")
+
+    query = st.text_input("搜索标题与摘要 (多个词按相关度综合排序)", key="t7_query")
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        search_conf = st.selectbox("会议", ["全部"] + basic_info['conferences'], key="t7_conf")
+    with c2:
+        search_year = st.selectbox("年份", ["全部"] + list(basic_info['years']), key="t7_year")
+    with c3:
+        search_top_k = st.slider("最多返回", 10, 500, 100, step=10, key="t7_top")
+    search_conf = None if search_conf == "全部" else search_conf
+    search_year = None if search_year == "全部" else search_year
+
+    if query:
+        results = analyzer.search_papers(query, top_k=search_top_k, year=search_year,
+                                         conference=search_conf)
+        st.write(f"找到 {len(results)} 篇相关论文：")
+        render_paper_list(results, key="t7_papers", fetch_details=analyzer.get_paper_details,
+                          fetch_related=analyzer.get_related_papers,
+                          columns=['score', 'title', 'authors', 'year', 'conference'],
+                          sort_options=SEARCH_SORT_OPTIONS)
+
+# --- 功能 8: 合作网络 ---
+with tab8:
+    st.subheader("🤝 作者合作网络")
+
+    st.markdown("### 👥 作者的合作圈")
+    c1, c2, c3 = st.columns([2, 1, 1])
+    with c1:
+        collab_query = st.text_input("按姓名筛选作者 (前缀匹配，留空显示全部)", key="t8_query")
+        if collab_query:
+            collab_authors = analyzer.search_authors(collab_query, match='prefix') \
+                or analyzer.search_authors(collab_query, match='substring')
+        else:
+            collab_authors = analyzer.get_all_authors_list()
+        collab_author = st.selectbox("选择作者", collab_authors, key="t8_author")
+    with c2:
+        collab_hops = st.slider("扩展跳数", 1, 3, 2, key="t8_hops")
+    with c3:
+        collab_max = st.slider("最多显示作者数", 20, 300, 100, step=10, key="t8_max")
+
+    if collab_author:
+        c_bar, c_net = st.columns([1, 2])
+        with c_bar:
+            top_collab = analyzer.get_top_collaborators(collab_author, limit=15)
+            if top_collab.empty:
+                st.info("该作者没有合作者。")
+            else:
+                fig_collab = px.bar(top_collab, x='Joint_Papers', y='Collaborator', orientation='h',
+                                    title="合作最多的作者", labels={'Joint_Papers': '合作论文数'})
+                fig_collab.update_layout(yaxis={'categoryorder': 'total ascending'})
+                st.plotly_chart(fig_collab, use_container_width=True)
+        with c_net:
+            hood_nodes, hood_edges = analyzer.get_author_neighborhood(
+                collab_author, hops=collab_hops, max_nodes=collab_max)
+            if len(hood_nodes) > 1:
+                # 同心圆布局：第 k 跳的作者排在第 k 圈上
+                pos = {}
+                for hop, group in hood_nodes.groupby('Hop'):
+                    angles = np.linspace(0, 2 * np.pi, len(group), endpoint=False)
+                    pos.update({a: (hop * np.cos(t), hop * np.sin(t)) for a, t in zip(group['Author'], angles)})
+                edge_x, edge_y = [], []
+                for src, dst in zip(hood_edges['Source'], hood_edges['Target']):
+                    edge_x += [pos[src][0], pos[dst][0], None]
+                    edge_y += [pos[src][1], pos[dst][1], None]
+                fig_hood = go.Figure([
+                    go.Scatter(x=edge_x, y=edge_y, mode='lines', hoverinfo='none',
+                               line=dict(width=0.5, color='#cccccc')),
+                    go.Scatter(x=[pos[a][0] for a in hood_nodes['Author']],
+                               y=[pos[a][1] for a in hood_nodes['Author']],
+                               mode='markers', hoverinfo='text',
+                               hovertext=[f"{a} (第 {h} 跳, {p} 篇)" for a, h, p in
+                                          zip(hood_nodes['Author'], hood_nodes['Hop'], hood_nodes['Papers'])],
+                               marker=dict(size=6 + 3 * np.sqrt(hood_nodes['Papers']), color=hood_nodes['Hop'],
+                                           colorscale='Viridis', showscale=True)),
+                ])
+                fig_hood.update_layout(showlegend=False, height=600, title=f"{collab_author} 的 {collab_hops} 跳合作网络",
+                                       xaxis=dict(visible=False), yaxis=dict(visible=False, scaleanchor='x'))
+                st.plotly_chart(fig_hood, use_container_width=True)
+
+    st.markdown("---")
+    st.markdown("### 🧩 关键词下的合作社区")
+    c1, c2 = st.columns([2, 1])
+    with c1:
+        community_kw = st.selectbox("选择关键词", all_unique_kws, key="t8_kw")
+    with c2:
+        community_min = st.slider("最小社区人数", 2, 20, 3, key="t8_min")
+    if community_kw:
+        communities = analyzer.get_keyword_communities(community_kw, min_size=community_min)
+        st.write(f"**{community_kw}** 领域共有 {len(communities)} 个合作社区 (人数 ≥ {community_min})：")
+        st.dataframe(communities, hide_index=True, use_container_width=True)
+
+    st.markdown("---")
+    st.markdown("### 🌟 核心作者")
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        central_year = st.selectbox("年份", ["全部"] + list(basic_info['years']), key="t8_year")
+    with c2:
+        central_conf = st.selectbox("会议", ["全部"] + basic_info['conferences'], key="t8_conf")
+    with c3:
+        central_metric = st.radio("指标", ["pagerank", "degree"], horizontal=True, key="t8_metric",
+                                  format_func=lambda m: "PageRank" if m == "pagerank" else "合作者人数")
+    central = analyzer.get_central_authors(year=None if central_year == "全部" else central_year,
+                                           conference=None if central_conf == "全部" else central_conf,
+                                           metric=central_metric, limit=30)
+    st.dataframe(central, hide_index=True, use_container_width=True)
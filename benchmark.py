@@ -0,0 +1,273 @@
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import logging
+from datetime import datetime
+
+import click
+import numpy as np
+import pandas as pd
+
+from analysis import PaperAnalyzer
+from data import PaperMeta, from_meta_to_csv, read_papers_from_csv, save_papers_to_csv
+from graph import CoauthorGraph
+from search import SearchIndex
+from similarity import SimilarityIndex
+
+CONFERENCES = ['icse', 'fse', 'ase', 'issta', 'msr', 'icsme']
+YEARS = (2010, 2025)
+# Words generated per chunk of papers, so 1M abstracts never sit in one array
+CHUNK = 50000
+
+
+def _zipf(n, exponent=1.0):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _sentences(rng, vocabulary, weights, n_rows, n_words):
+    """n_rows strings of n_words Zipf-distributed words each."""
+    out = []
+    for start in range(0, n_rows, CHUNK):
+        rows = min(CHUNK, n_rows - start)
+        words = vocabulary[rng.choice(len(vocabulary), (rows, n_words), p=weights)]
+        out.extend(' '.join(row) for row in words)
+    return out
+
+
+def make_corpus(n_papers, n_keywords=2000, n_authors=None, seed=0, abstract_words=0, title_words=8,
+                vocabulary_size=30000):
+    """
+    Build a synthetic corpus in the same shape as meta.csv.
+
+    Keywords, authors and title/abstract words follow Zipf-like popularity so
+    that a few topics and authors dominate, as in real proceedings. Titles
+    stay unique because from_meta_to_csv deduplicates by title.
+    """
+    rng = np.random.default_rng(seed)
+    random.seed(seed)
+    if n_authors is None:
+        n_authors = max(50000, n_papers // 2)
+    keywords = np.array([f"Keyword {i}" for i in range(n_keywords)], dtype=object)
+    authors = np.array([f"Author {i}" for i in range(n_authors)], dtype=object)
+    kw_weights = _zipf(n_keywords)
+    au_weights = _zipf(n_authors, 0.8)
+
+    kw_per_paper = rng.integers(1, 6, n_papers)
+    au_per_paper = rng.integers(1, 7, n_papers)
+    kw_draw = rng.choice(n_keywords, kw_per_paper.sum(), p=kw_weights)
+    au_draw = rng.choice(n_authors, au_per_paper.sum(), p=au_weights)
+    kw_split = np.split(keywords[kw_draw], np.cumsum(kw_per_paper)[:-1])
+    au_split = np.split(authors[au_draw], np.cumsum(au_per_paper)[:-1])
+
+    vocabulary = np.array([f"w{i}" for i in range(vocabulary_size)], dtype=object)
+    word_weights = _zipf(vocabulary_size)
+    titles = _sentences(rng, vocabulary, word_weights, n_papers, title_words) if title_words else [''] * n_papers
+    abstracts = _sentences(rng, vocabulary, word_weights, n_papers, abstract_words) if abstract_words else ''
+
+    return pd.DataFrame({
+        'id': np.arange(1, n_papers + 1),
+        'conference': rng.choice(CONFERENCES, n_papers),
+        'year': rng.integers(YEARS[0], YEARS[1] + 1, n_papers),
+        'title': [f"{title} {i}".strip() for i, title in enumerate(titles)],
+        'authors': [",".join(a) for a in au_split],
+        'abstract': abstracts,
+        'keywords': [",".join(k) for k in kw_split],
+    })
+
+
+def timed(func, *args, repeat=3, setup=None, **kwargs):
+    """Best wall time of ``repeat`` runs; ``setup`` runs before each one and is not timed."""
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func, setup=None):
+    """Peak bytes allocated (Python and numpy) during one run of ``func``."""
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def query_cases(analyzer):
+    """Every public PaperAnalyzer query, with arguments taken from the corpus itself."""
+    info = analyzer.get_basic_info()
+    year, conference = info['years'][-1], info['conferences'][0]
+    keyword = analyzer.kw_names[np.argmax(analyzer.kw_matrix.sum(axis=0))]
+    author = analyzer.author_names[np.argmax(analyzer.author_matrix.sum(axis=0))]
+    author_papers = analyzer.get_papers_by_author(author)
+    word = analyzer.search_index.terms[len(analyzer.search_index.terms) // 2] \
+        if analyzer.search_index is not None and len(analyzer.search_index.terms) else 'w100'
+    return {
+        'get_basic_info': lambda: analyzer.get_basic_info(),
+        'get_keyword_stats': lambda: analyzer.get_keyword_stats(year=year, limit=20),
+        'get_keyword_stats[conference]': lambda: analyzer.get_keyword_stats(year=year, conference=conference),
+        'get_papers_by_keyword_strict': lambda: analyzer.get_papers_by_keyword_strict(keyword),
+        'get_papers_by_author': lambda: analyzer.get_papers_by_author(author),
+        'get_paper_details': lambda: analyzer.get_paper_details(range(20)),
+        'search_keywords': lambda: analyzer.search_keywords('Keyword 1'),
+        'search_authors': lambda: analyzer.search_authors('Author 1'),
+        'search_papers': lambda: analyzer.search_papers(word, year=year),
+        'get_related_papers': lambda: analyzer.get_related_papers(0),
+        'get_authors_by_keyword': lambda: analyzer.get_authors_by_keyword(keyword),
+        'get_author_stats': lambda: analyzer.get_author_stats(year=year, limit=20),
+        'get_author_profile': lambda: analyzer.get_author_profile(author),
+        'get_all_authors_list': lambda: analyzer.get_all_authors_list(),
+        'get_all_keywords_list': lambda: analyzer.get_all_keywords_list(),
+        'get_keyword_trend_data': lambda: analyzer.get_keyword_trend_data(),
+        'get_yearly_top_k_matrix': lambda: analyzer.get_yearly_top_k_matrix(),
+        'get_author_keyword_details': lambda: analyzer.get_author_keyword_details(author_papers),
+        'get_keyword_cooccurrence': lambda: analyzer.get_keyword_cooccurrence(),
+        'get_top_keyword_pairs': lambda: analyzer.get_top_keyword_pairs(),
+        'get_associated_keywords': lambda: analyzer.get_associated_keywords(keyword, metric='lift'),
+        'get_topic_network': lambda: analyzer.get_topic_network(),
+        'get_emerging_keywords': lambda: analyzer.get_emerging_keywords(),
+        'get_top_collaborators': lambda: analyzer.get_top_collaborators(author),
+        'get_author_neighborhood': lambda: analyzer.get_author_neighborhood(author),
+        'get_keyword_communities': lambda: analyzer.get_keyword_communities(keyword),
+        'get_central_authors': lambda: analyzer.get_central_authors(year=year),
+    }
+
+
+def missing_queries(cases):
+    """Public query methods that the suite does not cover yet."""
+    public = {name for name in dir(PaperAnalyzer)
+              if name.startswith(('get_', 'search_')) and callable(getattr(PaperAnalyzer, name))}
+    covered = {name.split('[')[0] for name in cases}
+    return sorted(public - covered)
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(n_papers, repeat, memory, abstract_words, workdir):
+    """Benchmark one corpus size; returns a list of result dicts."""
+    results = []
+
+    def record(group, name, func, setup=None, runs=repeat):
+        seconds = timed(func, repeat=runs, setup=setup)
+        peak = peak_memory(func, setup=setup) if memory else None
+        results.append({'size': n_papers, 'group': group, 'name': name,
+                        'seconds': seconds, 'peak_bytes': peak})
+        peak_text = f"{peak / 2**20:9.1f} MiB" if peak is not None else ''
+        print(f"  {group:<9} {name:<32} {seconds * 1000:10.1f} ms {peak_text}")
+
+    print(f"corpus: {n_papers} papers")
+    df = make_corpus(n_papers, abstract_words=abstract_words)
+    path = os.path.join(workdir, f'meta-{n_papers}.csv')
+    scratch = os.path.join(workdir, 'scratch.csv')
+    df.to_csv(path, index=False)
+    del df
+
+    # data.py: CSV round-trip and appending a crawled batch
+    records = read_papers_from_csv(path)
+    record('data', 'read_papers_from_csv', lambda: read_papers_from_csv(path))
+    record('data', 'save_papers_to_csv', lambda: save_papers_to_csv(scratch, records))
+    batch = [PaperMeta(title=f"New paper {i}", authors="Author 1,Author 2", abstract="new abstract")
+             for i in range(1000)]
+    url = "https://conf.researchr.org/track/icse-2026/icse-2026-research-track"
+    record('data', 'from_meta_to_csv[+1000]', lambda: from_meta_to_csv(scratch, url, batch),
+           setup=lambda: shutil.copy(path, scratch))
+    del records
+
+    # analysis.py: loading and the one-off index builds
+    record('load', 'load_data', lambda: PaperAnalyzer.load_data(path, verbose=False))
+    df = PaperAnalyzer.load_data(path, verbose=False)
+    record('build', 'PaperAnalyzer', lambda: PaperAnalyzer(df), runs=1)
+    analyzer = PaperAnalyzer(df)
+    record('build', 'coauthor_graph', lambda: CoauthorGraph.from_papers(analyzer.author_matrix), runs=1)
+    record('build', 'search_index',
+           lambda: SearchIndex.build(analyzer._paper_ids(), *analyzer._text_columns(analyzer.raw_df)), runs=1)
+    analyzer.search_index = SearchIndex.build(analyzer._paper_ids(), *analyzer._text_columns(analyzer.raw_df))
+    record('build', 'similarity',
+           lambda: SimilarityIndex.from_search_index(analyzer.search_index, analyzer.kw_incidence), runs=1)
+    analyzer._similarity = SimilarityIndex.from_search_index(analyzer.search_index, analyzer.kw_incidence)
+    analyzer._coauthor_graph = CoauthorGraph.from_papers(analyzer.author_matrix)
+
+    # Every query used to re-explode the corpus at least once; this is that cost.
+    record('query', 'legacy_explode', lambda: analyzer._explode_column(analyzer.raw_df, 'keywords'))
+    # Every query, with the lazy structures already built
+    cases = query_cases(analyzer)
+    for name, query in cases.items():
+        record('query', name, query)
+    missing = missing_queries(cases)
+    if missing:
+        print(f"  not benchmarked: {', '.join(missing)}")
+    return results
+
+
+def compare(results, baseline_path):
+    """Print the time ratio against an earlier results file."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    old = {(r['size'], r['group'], r['name']): r for r in baseline['results']}
+    print(f"\ncompared with {baseline_path} ({baseline.get('revision')}):")
+    for r in results:
+        before = old.get((r['size'], r['group'], r['name']))
+        if before and before['seconds']:
+            ratio = r['seconds'] / before['seconds']
+            flag = '  <-- slower' if ratio > 1.2 else ''
+            print(f"  {r['size']:>8} {r['name']:<32} {before['seconds'] * 1000:10.1f} -> "
+                  f"{r['seconds'] * 1000:10.1f} ms ({ratio:5.2f}x){flag}")
+
+
+@click.command()
+@click.option("--sizes", default="10000,100000,1000000", help="Corpus sizes, comma separated", show_default=True)
+@click.option("--repeat", default=3, type=click.INT, help="Runs per case, best is reported", show_default=True)
+@click.option("--memory/--no-memory", default=True, type=click.BOOL,
+              help="Also measure peak memory with tracemalloc (one extra run per case)", show_default=True)
+@click.option("--abstract-words", default=60, type=click.INT, help="Words per synthetic abstract",
+              show_default=True)
+@click.option("--output", default="benchmark-results.json", help="Machine-readable results file",
+              show_default=True)
+@click.option("--compare", "baseline", default=None, help="Earlier results file to compare against")
+def main(sizes, repeat, memory, abstract_words, output, baseline):
+    # The data.py helpers log every write; keep the table readable
+    logging.getLogger('ConfBot-Data').setLevel(logging.WARNING)
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in [int(s) for s in sizes.split(',') if s.strip()]:
+            results.extend(run_size(size, repeat, memory, abstract_words, workdir))
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'abstract_words': abstract_words,
+        'results': results,
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {output}")
+    if baseline:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import streamlit as st
+
+# 每页显示的论文数
+PAGE_SIZE = 20
+# 列表中显示的字段，摘要不在其中，只在选中时获取
+LIST_COLUMNS = ['title', 'authors', 'year', 'conference', 'keywords']
+# 选中论文时显示的相关论文数
+RELATED_TOP_K = 5
+# 排序方式 -> (排序列, 是否升序)
+SORT_OPTIONS = {
+    "年份 (新→旧)": (['year', 'title'], [False, True]),
+    "年份 (旧→新)": (['year', 'title'], [True, True]),
+    "标题 (A→Z)": (['title'], [True]),
+    "会议": (['conference', 'year', 'title'], [True, False, True]),
+}
+# 搜索结果默认按相关度排序
+SEARCH_SORT_OPTIONS = {"相关度": (['score'], [False]), **SORT_OPTIONS}
+
+
+def sort_papers(papers, sort_by, sort_options=SORT_OPTIONS):
+    """在服务端排序，只对排序列取序，不复制整张表"""
+    cols, ascending = sort_options[sort_by]
+    cols_present = [c for c in cols if c in papers.columns]
+    if not cols_present:
+        return papers.index
+    ascending = [a for c, a in zip(cols, ascending) if c in papers.columns]
+    return papers[cols_present].sort_values(cols_present, ascending=ascending,
+                                            na_position='last', kind='stable').index
+
+
+def render_paper_list(papers, key, fetch_details, columns=LIST_COLUMNS, page_size=PAGE_SIZE,
+                      sort_options=SORT_OPTIONS, fetch_related=None):
+    """
+    分页的论文列表：一次只渲染一页的表格，勾选的论文才会获取并显示摘要
+    papers: 匹配的论文 (索引为 raw_df 的索引)
+    fetch_details: 索引列表 -> 含 abstract 列的 DataFrame
+    fetch_related: (索引, top_k) -> 相关论文 DataFrame (含 similarity 列)，可选
+    """
+    total = len(papers)
+    if total == 0:
+        st.info("没有匹配的论文。")
+        return
+
+    n_pages = (total + page_size - 1) // page_size
+    page_key = f"{key}_page"
+    # 匹配结果变少时，之前的页码可能越界
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = 1
+
+    c_sort, c_page, c_info = st.columns([2, 1, 2])
+    with c_sort:
+        sort_by = st.selectbox("排序方式", list(sort_options), key=f"{key}_sort")
+    with c_page:
+        page = st.number_input(f"页码 (共 {n_pages} 页)", min_value=1, max_value=n_pages,
+                               value=1, step=1, key=page_key)
+    start = (page - 1) * page_size
+    end = min(start + page_size, total)
+    with c_info:
+        st.caption(f"第 {start + 1}-{end} 篇 / 共 {total} 篇，勾选行查看摘要")
+
+    page_index = sort_papers(papers, sort_by, sort_options)[start:end]
+    page_df = papers.loc[page_index, [c for c in columns if c in papers.columns]]
+    # 表格的选择状态按页和排序方式区分，翻页后不会沿用上一页的勾选
+    event = st.dataframe(page_df, hide_index=True, use_container_width=True,
+                         on_select="rerun", selection_mode="multi-row",
+                         key=f"{key}_table_{sort_by}_{page}")
+
+    selected = [i for i in event.selection.rows if i < len(page_df)]
+    if not selected:
+        return
+    details = fetch_details(page_df.index[selected].tolist())
+    for idx in page_df.index[selected]:
+        row = page_df.loc[idx]
+        with st.container(border=True):
+            st.markdown(f"**📄 {row['title']}**")
+            if 'authors' in row:
+                st.caption(f"👥 {row['authors']}")
+            if 'keywords' in row:
+                st.markdown(f"**🏷️ Keywords:** {row['keywords']}")
+            if 'abstract' in details.columns:
+                st.markdown("**📝 Abstract:**")
+                st.write(details.loc[idx, 'abstract'])
+            if fetch_related is not None:
+                related = fetch_related(int(idx), top_k=RELATED_TOP_K)
+                if not related.empty:
+                    st.markdown("**🔗 Related Papers:**")
+                    for _, paper in related.iterrows():
+                        st.markdown(f"- {paper['title']} ({paper['conference']} {paper['year']}, "
+                                    f"相似度 {paper['similarity']:.2f})")
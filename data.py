@@ -3,7 +3,9 @@ import os
 import re
 import logging
 from dataclasses import dataclass
-from typing import List
+from typing import List, Set, Tuple
+
+from profiling import span, traced
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('ConfBot-Data')
@@ -27,11 +29,33 @@ class PaperRecord:
     keyword: str = "" 
 
 
-def from_meta_to_csv(path, url, result: List[PaperMeta]):
-    logger.info("Analysis the conference and year...")
+FIELDNAMES = ['id', 'conference', 'year', 'title', 'authors', 'abstract', 'keywords']
+
+
+def record_to_row(paper: PaperRecord) -> dict:
+    return {
+        'id': paper.id,
+        'conference': paper.conference,
+        'year': paper.year,
+        'title': paper.title,
+        'authors': paper.authors,
+        'keywords': paper.keyword,
+        'abstract': paper.abstract
+    }
+
+
+def split_values(text) -> list:
+    """Split a keywords/authors cell the same way PaperAnalyzer explodes it."""
+    if not text:
+        return []
+    text = str(text).replace(';', ',').replace('，', ',')
+    return [part.strip() for part in text.split(',') if part.strip()]
+
+
+def parse_conf_year(url) -> Tuple[str, str]:
     year_match = re.search(r'20\d{2}', url)
     current_year = year_match.group(0) if year_match else "Unknown"
-    
+
     url_lower = url.lower()
     current_conf = "Unknown"
     valid_confs = ['icse', 'ase', 'fse', 'issta']
@@ -39,9 +63,16 @@ def from_meta_to_csv(path, url, result: List[PaperMeta]):
         if conf in url_lower:
             current_conf = conf
             break
+    return current_conf, current_year
+
+
+@traced(cat='io')
+def from_meta_to_csv(path, url, result: List[PaperMeta]):
+    logger.info("Analysis the conference and year...")
+    current_conf, current_year = parse_conf_year(url)
     logger.info(f"Conf: {current_conf}, Year: {current_year}")
-    fieldnames = ['id', 'conference', 'year', 'title', 'authors', 'abstract', 'keywords']
-    
+    fieldnames = FIELDNAMES
+
     all_rows = []
     existing_titles = set()
     next_id = 1
@@ -77,7 +108,7 @@ def from_meta_to_csv(path, url, result: List[PaperMeta]):
     
     logger.info("Write back to file...")
     try:
-        with open(path, mode='w', encoding='utf-8', newline='') as f:
+        with span('write_csv', cat='io'), open(path, mode='w', encoding='utf-8', newline='') as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
             writer.writerows(all_rows)
@@ -88,6 +119,40 @@ def from_meta_to_csv(path, url, result: List[PaperMeta]):
         logger.info(f"Failed to write into file {e}")
 
 
+@traced(cat='io')
+def load_existing_titles(path: str) -> Tuple[Set[str], int]:
+    """Return the titles already stored in ``path`` and the next free id."""
+    titles = set()
+    next_id = 1
+    if not os.path.exists(path):
+        return titles, next_id
+    try:
+        with open(path, mode='r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                titles.add(row['title'])
+                if row['id'].isdigit():
+                    next_id = max(next_id, int(row['id']) + 1)
+    except Exception as e:
+        logger.info(f"Failed to read file {e}. Start from an empty file.")
+    return titles, next_id
+
+
+@traced(cat='io')
+def append_papers_to_csv(path: str, papers: List[PaperRecord]):
+    """Append records without rewriting the file; the header is written on first use."""
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+    try:
+        with open(path, mode='a', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+            if write_header:
+                writer.writeheader()
+            for paper in papers:
+                writer.writerow(record_to_row(paper))
+    except IOError as e:
+        logger.error(f"Failed to append to file {e}")
+
+
+@traced(cat='io')
 def read_papers_from_csv(path: str) -> List[PaperRecord]:
     results = []
     if not os.path.exists(path):
@@ -115,27 +180,17 @@ def read_papers_from_csv(path: str) -> List[PaperRecord]:
         return []
 
 
+@traced(cat='io')
 def save_papers_to_csv(path: str, papers: List[PaperRecord]):
     # Define header order
-    fieldnames = ['id', 'conference', 'year', 'title', 'authors', 'abstract', 'keywords']
+    fieldnames = FIELDNAMES
     
     try:
         # Use 'w' mode to overwrite
         with open(path, mode='w', encoding='utf-8', newline='') as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
-            
-            for paper in papers:
-                row = {
-                    'id': paper.id,
-                    'conference': paper.conference,
-                    'year': paper.year,
-                    'title': paper.title,
-                    'authors': paper.authors, 
-                    'keywords': paper.keyword,
-                    'abstract': paper.abstract
-                }
-                writer.writerow(row)
+            writer.writerows(record_to_row(paper) for paper in papers)
     except Exception as e:
         logger.error(f"Failed to save file: {e}")
 
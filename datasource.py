@@ -0,0 +1,297 @@
+import copy
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from analysis import PaperAnalyzer, _has_pyarrow, detect_encoding
+from search import SearchIndex, index_path, text_hashes
+from similarity import NeighborTable, related_path
+
+# 校验追加时比较的文件尾部字节数
+TAIL_CHECK_BYTES = 4096
+# 看板不常驻内存的大文本列，需要时按行号从文件读取 (见 CsvRecords)
+DETAIL_COLUMNS = ('abstract',)
+# 扫描记录边界时每次读入的字节数
+SCAN_CHUNK_BYTES = 1 << 24
+
+
+def scan_records(f, start, end, final=False):
+    """
+    文件 [start, end) 字节内完整记录的 (起点, 终点) 位置数组，终点含换行符
+    引号内的换行不是记录边界：csv 模块只在带引号的字段中写出引号，因此某个换行之前的
+    引号总数为偶数时它才结束一条记录 (GBK 双字节字符的两个字节都不会是引号或换行)
+    final: 末尾没有换行的最后一条记录也算完整；空行与 pandas 一样跳过
+    """
+    bounds = [np.array([start], dtype=np.int64)]
+    quotes = 0
+    pos = start
+    f.seek(start)
+    while pos < end:
+        buf = np.frombuffer(f.read(min(SCAN_CHUNK_BYTES, end - pos)), dtype=np.uint8)
+        if not len(buf):
+            break
+        newlines = np.flatnonzero(buf == ord('\n'))
+        quote_pos = np.flatnonzero(buf == ord('"'))
+        even = (quotes + np.searchsorted(quote_pos, newlines)) % 2 == 0
+        bounds.append(pos + newlines[even] + 1)
+        quotes += len(quote_pos)
+        pos += len(buf)
+    bounds = np.concatenate(bounds)
+    if final and bounds[-1] < pos:
+        bounds = np.append(bounds, pos)
+    starts, ends = bounds[:-1], bounds[1:]
+    blank = ends - starts == 1
+    for i in np.flatnonzero(ends - starts == 2):
+        f.seek(starts[i])
+        blank[i] = f.read(1) == b'\r'
+    return starts[~blank], ends[~blank]
+
+
+class CsvRecords:
+    """
+    meta.csv 中每篇论文所在记录的字节位置，用于只读取几篇论文的某些列 (如摘要)
+    第 i 条记录对应分析器 raw_df 的第 i 行；对象不可变，追加记录时返回新对象
+    """
+
+    def __init__(self, path, encoding, header, starts, ends, columns):
+        self.path = path
+        self.encoding = encoding
+        self.header = header
+        self.starts = starts
+        self.ends = ends
+        # 由本对象提供的列
+        self.columns = tuple(columns)
+
+    @classmethod
+    def from_file(cls, path, encoding, size, columns):
+        with open(path, 'rb') as f:
+            starts, ends = scan_records(f, 0, size, final=True)
+            if not len(starts):
+                return cls(path, encoding, b'', starts, ends, ())
+            f.seek(starts[0])
+            header = f.read(ends[0] - starts[0])
+        names = pd.read_csv(io.BytesIO(header), encoding=encoding, nrows=0).columns
+        return cls(path, encoding, header, starts[1:], ends[1:], [c for c in columns if c in names])
+
+    def extend(self, starts, ends):
+        return CsvRecords(self.path, self.encoding, self.header, np.concatenate([self.starts, starts]),
+                          np.concatenate([self.ends, ends]), self.columns)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def read(self, rows, columns):
+        """第 rows 条记录的 columns 列 (字符串，缺失为空字符串)，索引为行号"""
+        rows = np.asarray(rows, dtype=np.int64)
+        parts = []
+        with open(self.path, 'rb') as f:
+            for start, end in zip(self.starts[rows], self.ends[rows]):
+                f.seek(start)
+                part = f.read(end - start)
+                parts.append(part if part.endswith(b'\n') else part + b'\n')
+        df = pd.read_csv(io.BytesIO(self.header + b''.join(parts)), encoding=self.encoding,
+                         usecols=list(columns), dtype=str, keep_default_na=False)
+        df.index = rows
+        return df
+
+    def values(self, rows, col):
+        """某一列在 rows 上的值；行数较多时整列读取再取出这些行，比逐条定位快"""
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) * 8 < len(self):
+            return self.read(rows, [col])[col].tolist()
+        values = pd.read_csv(self.path, encoding=self.encoding, usecols=[col], dtype=str, keep_default_na=False,
+                             engine='pyarrow' if _has_pyarrow() else 'c')[col].to_numpy(dtype=object)
+        return values[rows].tolist()
+
+
+class DataSource:
+    """
+    感知变化的数据源：记住上次读到的文件位置，数据变化时增量更新分析器
+
+    - 文件 (mtime, 大小) 未变：直接返回当前分析器
+    - 文件只在末尾追加 (流式流水线 append_papers_to_csv)：只解析新增的字节，
+      跳过 id 已加载过的行后 extend 到分析器 (多线程流水线按打标完成的顺序追加，id 不保证递增)
+    - 文件被整体重写 (save_papers_to_csv 回写关键词)：重新解析，
+      若只是已有论文的关键词变化 / 末尾新增论文，则只更新这些行；
+      其它列 (标题、作者、摘要等) 有变化时完整重建
+    摘要不加载到内存 (占 meta.csv 的绝大部分)，只记录每条记录的字节位置，
+    查看详情、构建全文索引时再从文件读取
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.analyzer = None
+        self.version = 0
+        self._lock = threading.RLock()
+        self._stamp = None
+        self._offset = 0
+        self._tail = b''
+        self._header = b''
+        self._encoding = 'utf-8'
+        self._loaded_ids = set()
+
+    def refresh(self):
+        """检查文件变化并返回最新的分析器"""
+        with self._lock:
+            if not os.path.exists(self.path):
+                if self.analyzer is None:
+                    self.analyzer = PaperAnalyzer(pd.DataFrame())
+                return self.analyzer
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if stamp == self._stamp:
+                return self.analyzer
+
+            if self.analyzer is None:
+                self._full_load()
+            elif stat.st_size > self._offset and self._is_append():
+                self._load_appended(stat.st_size)
+            else:
+                self._reload()
+            self._stamp = stamp
+            return self.analyzer
+
+    def snapshot(self):
+        """刷新并同时返回分析器和它的版本号，二者保证一致 (用作查询缓存的键)"""
+        with self._lock:
+            return self.refresh(), self.version
+
+    def _remember_position(self, offset):
+        """记录已消费到的位置，以及该位置前的一段字节用于判断后续是否只是追加"""
+        self._offset = offset
+        with open(self.path, 'rb') as f:
+            self._header = f.readline()
+            f.seek(max(0, offset - TAIL_CHECK_BYTES))
+            self._tail = f.read(min(offset, TAIL_CHECK_BYTES))
+
+    def _is_append(self):
+        with open(self.path, 'rb') as f:
+            f.seek(max(0, self._offset - TAIL_CHECK_BYTES))
+            return f.read(len(self._tail)) == self._tail
+
+    def _remember_ids(self, df):
+        if 'id' in df.columns:
+            self._loaded_ids.update(df['id'].dropna().astype('int64').tolist())
+
+    def _publish(self, analyzer):
+        self.analyzer = analyzer
+        self.version += 1
+
+    def _build_analyzer(self, df, records):
+        """完整构建分析器，读取采集时保存的全文索引与相关论文"""
+        return PaperAnalyzer(df, search_index=SearchIndex.load(index_path(self.path)),
+                             related=NeighborTable.load(related_path(self.path)), details=records)
+
+    def _load_frame(self, size, verbose=True):
+        """
+        读取除 DETAIL_COLUMNS 以外的列，并记录文件前 size 字节中每条记录的位置
+        记录数与解析出的行数对不上时 (例如读取期间文件又有追加)，退回把全部列读入内存
+        """
+        encoding = detect_encoding(self.path)
+        names = pd.read_csv(self.path, encoding=encoding, nrows=0).columns
+        df = PaperAnalyzer.load_data(self.path, usecols=[c for c in names if c not in DETAIL_COLUMNS],
+                                     verbose=verbose)
+        self._encoding = df.attrs.get('encoding', encoding)
+        records = CsvRecords.from_file(self.path, self._encoding, size, DETAIL_COLUMNS)
+        if len(records) != len(df):
+            return PaperAnalyzer.load_data(self.path, verbose=False), None
+        return df, records
+
+    def _full_load(self):
+        size = os.path.getsize(self.path)
+        df, records = self._load_frame(size)
+        self._remember_ids(df)
+        self._publish(self._build_analyzer(df, records))
+        self._remember_position(size)
+
+    def _load_appended(self, size):
+        """只解析上次位置之后、最后一条完整记录为止的新增字节"""
+        with open(self.path, 'rb') as f:
+            starts, ends = scan_records(f, self._offset, size)
+            if not len(ends):
+                # 还没有写完整的一条记录，下次再读
+                return
+            f.seek(self._offset)
+            chunk = f.read(ends[-1] - self._offset)
+        try:
+            new_df = PaperAnalyzer.read_csv_typed(io.BytesIO(self._header + chunk), encoding=self._encoding)
+        except Exception:
+            new_df = None
+        if new_df is None or len(new_df) != len(starts):
+            # 解析失败或与记录边界对不上，退回完整重读
+            self._reload()
+            return
+        keep = np.ones(len(new_df), dtype=bool)
+        if 'id' in new_df.columns:
+            # 已经加载过的 id 不重复加入；没有 id 的行无法判断，照常加入
+            keep = ~new_df['id'].isin(self._loaded_ids).fillna(False).to_numpy(dtype=bool)
+        if keep.any():
+            # 在副本上更新再替换，其它会话读到的始终是一致的旧版本或新版本
+            analyzer = copy.copy(self.analyzer)
+            if analyzer.details is not None:
+                analyzer.details = analyzer.details.extend(starts[keep], ends[keep])
+            new_df = new_df[keep]
+            analyzer.extend(new_df)
+            self._remember_ids(new_df)
+            self._publish(analyzer)
+        self._remember_position(int(ends[-1]))
+
+    def _reload(self):
+        """
+        文件被重写：重新解析，但尽量只更新变化的行，而不是重新炸开整个语料
+        只有 "已有论文仅关键词变化 / 末尾新增论文" 会就地更新 (只炸开变化的行，
+        整数索引仍按 O(N) 向量化重建)；id、标题、作者、摘要等其它列有任何变化都完整重建
+        """
+        size = os.path.getsize(self.path)
+        df, records = self._load_frame(size, verbose=False)
+        old = self.analyzer.raw_df
+        n_old = len(old)
+        # 摘要不在 raw_df 中，按 (标题, 摘要) 的哈希判断是否变化
+        unchanged = self._only_keywords_changed(old, df) and np.array_equal(
+            text_hashes(*PaperAnalyzer._text_columns(df.iloc[:n_old], records)), self.analyzer.doc_hashes)
+        if not unchanged:
+            self._loaded_ids = set()
+            self._remember_ids(df)
+            self._publish(self._build_analyzer(df, records))
+            self._remember_position(size)
+            return
+
+        analyzer = copy.copy(self.analyzer)
+        # 文件被重写，记录位置随之改变
+        analyzer.details = records
+        new_kw = df['keywords'].iloc[:n_old].astype(str).to_numpy()
+        old_kw = old['keywords'].astype(str).to_numpy()
+        changed = np.flatnonzero(new_kw != old_kw)
+        if len(changed):
+            analyzer.update_keywords(changed, new_kw[changed])
+        if len(df) > n_old:
+            analyzer.extend(df.iloc[n_old:])
+        if len(changed) or len(df) > n_old:
+            self._remember_ids(df.iloc[n_old:])
+            self._publish(analyzer)
+        self._remember_position(size)
+
+    @staticmethod
+    def _only_keywords_changed(old, df):
+        """新数据以旧数据为前缀，且前缀部分除 keywords 外的所有列都没有变化"""
+        n_old = len(old)
+        if len(df) < n_old or 'id' not in df.columns or 'keywords' not in df.columns \
+                or list(df.columns) != list(old.columns):
+            return False
+        for col in df.columns:
+            if col == 'keywords':
+                continue
+            if col == 'id':
+                # 可空整数列：缺失 id 记为 -1 再比较
+                new_values = df[col].iloc[:n_old].to_numpy(dtype='int64', na_value=-1)
+                old_values = old[col].to_numpy(dtype='int64', na_value=-1)
+            else:
+                # 统一转为字符串比较，分类列与 Arrow 字符串列的类型不同也不影响
+                new_values = df[col].iloc[:n_old].astype('string').fillna('').to_numpy(dtype=object)
+                old_values = old[col].astype('string').fillna('').to_numpy(dtype=object)
+            if not np.array_equal(new_values, old_values):
+                return False
+        return True
@@ -0,0 +1,410 @@
+import json
+import os
+import logging
+from datetime import datetime
+
+import click
+import numpy as np
+import pandas as pd
+
+from analysis import PaperAnalyzer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('ConfBot-Export')
+logger.setLevel(logging.DEBUG)
+
+PLOTLY_CDN = "https://cdn.plot.ly/plotly-2.35.2.min.js"
+
+
+def _value(v):
+    """numpy / pandas scalars -> JSON values (missing becomes null)."""
+    if v is None or v is pd.NA or (isinstance(v, float) and np.isnan(v)):
+        return None
+    if isinstance(v, np.generic):
+        return v.item()
+    return v
+
+
+def _csr_lists(matrix, rows):
+    """Columns and values of the given CSR rows as plain lists."""
+    return [
+        (matrix.indices[matrix.indptr[r]:matrix.indptr[r + 1]].tolist(),
+         matrix.data[matrix.indptr[r]:matrix.indptr[r + 1]].tolist())
+        for r in rows
+    ]
+
+
+def build_bundle(analyzer: PaperAnalyzer, top_authors=100, min_count=1, include_papers=True,
+                 emerging_limit=20, collaborators=10):
+    """
+    Precompute every view of the dashboard from one analyzer.
+
+    Keyword counts are shipped as the (year, conference) x keyword cube so the
+    page can filter and re-aggregate them in the browser; author profiles and
+    emerging topics are computed here once.
+    """
+    years = [_value(y) for y in analyzer._years]
+    confs = [_value(c) for c in analyzer._confs]
+    n_conf_slots = len(confs) + 1
+    cells = [[int(c // n_conf_slots) if c // n_conf_slots < len(years) else None,
+              int(c % n_conf_slots) if c % n_conf_slots < len(confs) else None]
+             for c in range(analyzer._n_cells)]
+    papers_per_cell = np.bincount(analyzer._paper_cells(), minlength=analyzer._n_cells)
+
+    # Keyword x cell counts, restricted to keywords seen at least min_count times
+    kw_by_cell = analyzer.kw_cube.T
+    totals = kw_by_cell.sum(axis=1)
+    keep_kw = np.flatnonzero(totals >= min_count)
+    kw_by_cell = kw_by_cell.select_rows(keep_kw)
+    kw_remap = np.full(len(analyzer.kw_names), -1, dtype=np.int64)
+    kw_remap[keep_kw] = np.arange(len(keep_kw))
+    kw_indptr = np.concatenate([[0], np.cumsum(np.diff(kw_by_cell.indptr)[keep_kw])])
+
+    # Top authors by paper count, with their papers, keywords and collaborators
+    graph = analyzer.coauthor_graph
+    author_counts = graph.paper_counts
+    top = np.lexsort((np.arange(len(author_counts)), -author_counts))[:top_authors]
+    top = top[author_counts[top] > 0]
+    papers_of = analyzer.author_matrix.binarize().T
+    author_papers = _csr_lists(papers_of, top)
+
+    if include_papers:
+        paper_rows = np.arange(len(analyzer.raw_df))
+    else:
+        paper_rows = np.unique(np.concatenate([np.asarray(p, dtype=np.int64) for p, _ in author_papers])) \
+            if author_papers else np.array([], dtype=np.int64)
+    paper_pos = np.full(len(analyzer.raw_df), -1, dtype=np.int64)
+    paper_pos[paper_rows] = np.arange(len(paper_rows))
+
+    authors = []
+    for node, (rows, _) in zip(top, author_papers):
+        rows = np.asarray(rows, dtype=np.int64)
+        kw_counts = analyzer.kw_matrix.select_rows(rows).sum(axis=0)
+        kw_top = np.flatnonzero(kw_counts)
+        kw_top = kw_top[np.lexsort((kw_top, -kw_counts[kw_top]))][:20]
+        found, joint = graph.collaborators([node])
+        authors.append({
+            'name': analyzer.author_names[node],
+            'papers': paper_pos[rows].tolist(),
+            'keywords': [[analyzer.kw_names[k], int(kw_counts[k])] for k in kw_top],
+            'collaborators': [[analyzer.author_names[a], int(c)]
+                              for a, c in zip(found[:collaborators], joint[:collaborators])],
+        })
+
+    emerging = {}
+    for conf in [None] + confs:
+        emerging[conf or ''] = {
+            direction: analyzer.get_emerging_keywords(conference=conf, direction=direction,
+                                                      limit=emerging_limit).to_dict(orient='records')
+            for direction in ('rising', 'declining')
+        }
+
+    df = analyzer.raw_df
+    paper_keywords = _csr_lists(analyzer.kw_matrix, paper_rows)
+    conf_codes = analyzer._conf_codes[paper_rows]
+    year_codes = analyzer._year_codes[paper_rows]
+    papers = {
+        'title': [_value(v) for v in df['title'].to_numpy()[paper_rows]] if 'title' in df.columns else [],
+        'authors': [_value(v) for v in df['authors'].to_numpy()[paper_rows]],
+        'year': [int(c) if c >= 0 else None for c in year_codes],
+        'conference': [int(c) if c >= 0 else None for c in conf_codes],
+        'keywords': [[int(kw_remap[k]) for k in cols if kw_remap[k] >= 0] for cols, _ in paper_keywords],
+    }
+
+    info = analyzer.get_basic_info()
+    return {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'total_papers': int(info['total_papers']),
+        'years': years,
+        'conferences': confs,
+        'cells': cells,
+        'papers_per_cell': papers_per_cell.tolist(),
+        'keywords': analyzer.kw_names[keep_kw].tolist(),
+        'kw_indptr': kw_indptr.tolist(),
+        'kw_cells': kw_by_cell.indices.tolist(),
+        'kw_counts': kw_by_cell.data.tolist(),
+        'emerging': emerging,
+        'authors': authors,
+        'papers': papers,
+        'all_papers': bool(include_papers),
+    }
+
+
+def render_html(bundle, title):
+    data = json.dumps(bundle, ensure_ascii=False, separators=(',', ':'), default=_value)
+    # The bundle is inlined in a <script> tag
+    data = data.replace('</', '<\\/')
+    return (HTML_TEMPLATE.replace('__TITLE__', title)
+            .replace('__PLOTLY__', PLOTLY_CDN)
+            .replace('__DATA__', data))
+
+
+@click.command()
+@click.option("--metasave", default="meta.csv", help="Path of the paper CSV", show_default=True)
+@click.option("--out", default="report", help="Output directory of the bundle", show_default=True)
+@click.option("--title", default="学术论文数据分析报告", help="Title of the report page", show_default=True)
+@click.option("--top-authors", default=100, type=click.INT, help="Number of author profiles", show_default=True)
+@click.option("--min-count", default=1, type=click.INT,
+              help="Only ship keywords seen at least this many times", show_default=True)
+@click.option("--papers/--no-papers", default=True, type=click.BOOL,
+              help="Include every paper title for keyword drill-down", show_default=True)
+def main(metasave, out, title, top_authors, min_count, papers):
+    # One load and one analyzer; every view below is derived from its matrices
+    df = PaperAnalyzer.load_data(metasave, usecols=['id', 'conference', 'year', 'title', 'authors', 'keywords'])
+    analyzer = PaperAnalyzer(df)
+    bundle = build_bundle(analyzer, top_authors=top_authors, min_count=min_count, include_papers=papers)
+
+    os.makedirs(out, exist_ok=True)
+    with open(os.path.join(out, 'data.json'), 'w', encoding='utf-8') as f:
+        json.dump(bundle, f, ensure_ascii=False, separators=(',', ':'), default=_value)
+    with open(os.path.join(out, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(render_html(bundle, title))
+    logger.info(f"Exported {bundle['total_papers']} papers to {out}/index.html")
+
+
+HTML_TEMPLATE = r"""<!DOCTYPE html>
+<html lang="zh">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<script src="__PLOTLY__"></script>
+<style>
+  body { font-family: -apple-system, "Segoe UI", "PingFang SC", sans-serif; margin: 0; color: #222; }
+  header { padding: 16px 24px; background: #f5f6f8; border-bottom: 1px solid #e3e5e8; }
+  header h1 { margin: 0 0 4px; font-size: 22px; }
+  nav button { margin-right: 6px; padding: 6px 12px; border: 1px solid #ccc; background: #fff; border-radius: 4px; cursor: pointer; }
+  nav button.active { background: #1f77b4; color: #fff; border-color: #1f77b4; }
+  main { padding: 16px 24px; }
+  section { display: none; }
+  section.active { display: block; }
+  .filters { margin: 8px 0 16px; }
+  .filters label { margin-right: 16px; }
+  .row { display: flex; gap: 24px; flex-wrap: wrap; }
+  .row > div { flex: 1; min-width: 360px; }
+  table { border-collapse: collapse; font-size: 13px; width: 100%; }
+  th, td { border-bottom: 1px solid #eee; padding: 4px 8px; text-align: left; }
+  th { background: #fafafa; }
+  .muted { color: #777; font-size: 13px; }
+  .paper { padding: 6px 0; border-bottom: 1px solid #f0f0f0; }
+</style>
+</head>
+<body>
+<header>
+  <h1>__TITLE__</h1>
+  <div class="muted" id="summary"></div>
+  <nav>
+    <button data-view="overview" class="active">关键词热度</button>
+    <button data-view="trends">关键词趋势</button>
+    <button data-view="emerging">新兴主题</button>
+    <button data-view="authors">作者画像</button>
+    <button data-view="papers">论文检索</button>
+  </nav>
+</header>
+<main>
+  <section id="overview" class="active">
+    <div class="filters">
+      <label>年份 <select id="ov-year"></select></label>
+      <label>会议 <select id="ov-conf"></select></label>
+      <label>Top <input id="ov-k" type="number" min="5" max="100" value="20" style="width:60px"></label>
+    </div>
+    <div class="row"><div id="ov-chart"></div><div id="ov-table"></div></div>
+  </section>
+  <section id="trends">
+    <div class="filters">
+      <label>会议 <select id="tr-conf"></select></label>
+      <label>Top <input id="tr-k" type="number" min="3" max="30" value="10" style="width:60px"></label>
+    </div>
+    <div id="tr-chart"></div>
+    <h3>历年 Top 榜单</h3>
+    <div id="tr-table"></div>
+  </section>
+  <section id="emerging">
+    <div class="filters"><label>会议 <select id="em-conf"></select></label></div>
+    <div class="row"><div><h3>📈 上升最快</h3><div id="em-rising"></div></div>
+    <div><h3>📉 下降最快</h3><div id="em-declining"></div></div></div>
+  </section>
+  <section id="authors">
+    <div class="filters">
+      <label>作者 <input id="au-name" list="au-list" style="width:280px"></label>
+      <datalist id="au-list"></datalist>
+    </div>
+    <div id="au-summary" class="muted"></div>
+    <div class="row"><div id="au-conf"></div><div id="au-year"></div></div>
+    <div class="row"><div id="au-kw"></div><div><h3>主要合作者</h3><div id="au-collab"></div></div></div>
+    <h3>论文清单</h3>
+    <div id="au-papers"></div>
+  </section>
+  <section id="papers">
+    <div class="filters">
+      <label>关键词 <input id="pa-kw" list="kw-list" style="width:280px"></label>
+      <datalist id="kw-list"></datalist>
+      <label>年份 <select id="pa-year"></select></label>
+      <label>会议 <select id="pa-conf"></select></label>
+    </div>
+    <div id="pa-note" class="muted"></div>
+    <div id="pa-list"></div>
+  </section>
+</main>
+<script id="bundle" type="application/json">__DATA__</script>
+<script>
+const D = JSON.parse(document.getElementById('bundle').textContent);
+const nKw = D.keywords.length;
+const kwIndex = new Map(D.keywords.map((k, i) => [k, i]));
+const esc = s => String(s ?? '').replace(/[&<>"]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c]));
+const yearLabel = y => y === null ? 'Unknown' : D.years[y];
+const confLabel = c => c === null ? 'Unknown' : D.conferences[c];
+
+function fillSelect(id, values, label, withAll = true) {
+  const el = document.getElementById(id);
+  el.innerHTML = (withAll ? '<option value="">全部</option>' : '') +
+    values.map((v, i) => `<option value="${i}">${esc(label(i))}</option>`).join('');
+}
+function table(rows, columns) {
+  if (!rows.length) return '<p class="muted">暂无数据</p>';
+  return '<table><tr>' + columns.map(c => `<th>${esc(c[0])}</th>`).join('') + '</tr>' +
+    rows.map(r => '<tr>' + columns.map(c => `<td>${esc(c[1](r))}</td>`).join('') + '</tr>').join('') + '</table>';
+}
+// Cells that pass the year / conference filter ('' means all)
+function cellMask(year, conf) {
+  return D.cells.map(([y, c]) => (year === '' || y === +year) && (conf === '' || c === +conf));
+}
+function keywordCounts(mask) {
+  const counts = new Float64Array(nKw);
+  for (let k = 0; k < nKw; k++)
+    for (let j = D.kw_indptr[k]; j < D.kw_indptr[k + 1]; j++)
+      if (mask[D.kw_cells[j]]) counts[k] += D.kw_counts[j];
+  return counts;
+}
+function topK(counts, k) {
+  return Array.from(counts.keys()).filter(i => counts[i] > 0)
+    .sort((a, b) => counts[b] - counts[a] || a - b).slice(0, k);
+}
+function papersIn(mask) {
+  return D.papers_per_cell.reduce((s, n, c) => s + (mask[c] ? n : 0), 0);
+}
+
+function renderOverview() {
+  const year = document.getElementById('ov-year').value, conf = document.getElementById('ov-conf').value;
+  const k = +document.getElementById('ov-k').value || 20;
+  const mask = cellMask(year, conf), counts = keywordCounts(mask), top = topK(counts, k);
+  const total = counts.reduce((a, b) => a + b, 0);
+  Plotly.react('ov-chart', [{type: 'bar', orientation: 'h', x: top.map(i => counts[i]).reverse(),
+    y: top.map(i => D.keywords[i]).reverse(), marker: {color: '#1f77b4'}}],
+    {title: `Top ${k} 关键词 (${papersIn(mask)} 篇论文)`, height: 600, margin: {l: 220}});
+  document.getElementById('ov-table').innerHTML = table(top, [
+    ['关键词', i => D.keywords[i]], ['频次', i => counts[i]],
+    ['占比', i => (counts[i] / total * 100).toFixed(2) + '%']]);
+}
+
+function yearSeries(conf, kws) {
+  // keyword -> counts per year index
+  const series = kws.map(() => new Float64Array(D.years.length));
+  kws.forEach((k, s) => {
+    for (let j = D.kw_indptr[k]; j < D.kw_indptr[k + 1]; j++) {
+      const [y, c] = D.cells[D.kw_cells[j]];
+      if (y !== null && (conf === '' || c === +conf)) series[s][y] += D.kw_counts[j];
+    }
+  });
+  return series;
+}
+function renderTrends() {
+  const conf = document.getElementById('tr-conf').value;
+  const k = +document.getElementById('tr-k').value || 10;
+  const top = topK(keywordCounts(cellMask('', conf)), k);
+  const series = yearSeries(conf, top);
+  Plotly.react('tr-chart', top.map((kw, s) => ({type: 'scatter', mode: 'lines+markers',
+    name: D.keywords[kw], x: D.years, y: Array.from(series[s])})),
+    {title: `Top ${k} 关键词历年走势`, hovermode: 'x unified', height: 520});
+  const ranks = D.years.map((_, y) => {
+    const mask = D.cells.map(([cy, cc]) => cy === y && (conf === '' || cc === +conf));
+    return topK(keywordCounts(mask), k).map(i => `${D.keywords[i]}`);
+  });
+  const rows = Array.from({length: k}, (_, r) => r);
+  document.getElementById('tr-table').innerHTML = table(rows,
+    [['Rank', r => r + 1]].concat(D.years.map((y, yi) => [String(y), r => ranks[yi][r] ?? ''])));
+}
+
+function renderEmerging() {
+  const conf = document.getElementById('em-conf').value;
+  const views = D.emerging[conf === '' ? '' : D.conferences[+conf]] || {rising: [], declining: []};
+  const columns = [['关键词', r => r.Keyword], ['今年', r => r.Count], ['去年', r => r.Prev_Count],
+    ['同比 %', r => r.Growth], ['Z 值', r => r.Z_Score], ['爆发度', r => r.Burst]];
+  document.getElementById('em-rising').innerHTML = table(views.rising, columns);
+  document.getElementById('em-declining').innerHTML = table(views.declining, columns);
+}
+
+function paperHtml(p) {
+  const P = D.papers;
+  return `<div class="paper"><b>${esc(P.title[p])}</b><br><span class="muted">` +
+    `${esc(yearLabel(P.year[p]))} | ${esc(confLabel(P.conference[p]))} | ${esc(P.authors[p])}<br>` +
+    `🏷️ ${esc(P.keywords[p].map(k => D.keywords[k]).join(', '))}</span></div>`;
+}
+function countBy(values, label) {
+  const counts = new Map();
+  values.forEach(v => counts.set(label(v), (counts.get(label(v)) || 0) + 1));
+  return counts;
+}
+function renderAuthor() {
+  const name = document.getElementById('au-name').value;
+  const author = D.authors.find(a => a.name === name);
+  if (!author) { document.getElementById('au-summary').textContent = '请选择导出的作者'; return; }
+  const P = D.papers;
+  document.getElementById('au-summary').textContent = `${name} 共 ${author.papers.length} 篇论文`;
+  const confs = countBy(author.papers, p => confLabel(P.conference[p]));
+  Plotly.react('au-conf', [{type: 'pie', labels: [...confs.keys()], values: [...confs.values()], hole: 0.4}],
+    {title: '投稿会议分布', height: 360});
+  const years = countBy(author.papers, p => yearLabel(P.year[p]));
+  const yearKeys = [...years.keys()].sort();
+  Plotly.react('au-year', [{type: 'bar', x: yearKeys, y: yearKeys.map(y => years.get(y))}],
+    {title: '年度发文数', height: 360, xaxis: {type: 'category'}});
+  Plotly.react('au-kw', [{type: 'bar', orientation: 'h', x: author.keywords.map(k => k[1]).reverse(),
+    y: author.keywords.map(k => k[0]).reverse()}], {title: '研究关键词', height: 480, margin: {l: 200}});
+  document.getElementById('au-collab').innerHTML = table(author.collaborators,
+    [['合作者', c => c[0]], ['合作论文数', c => c[1]]]);
+  document.getElementById('au-papers').innerHTML = author.papers
+    .slice().sort((a, b) => (P.year[b] ?? -1) - (P.year[a] ?? -1)).map(paperHtml).join('');
+}
+
+function renderPapers() {
+  const kw = kwIndex.get(document.getElementById('pa-kw').value);
+  const year = document.getElementById('pa-year').value, conf = document.getElementById('pa-conf').value;
+  const note = document.getElementById('pa-note'), list = document.getElementById('pa-list');
+  note.textContent = D.all_papers ? '' : '此报告只包含导出作者的论文。';
+  if (kw === undefined) { list.innerHTML = ''; return; }
+  const P = D.papers, found = [];
+  for (let p = 0; p < P.title.length; p++)
+    if (P.keywords[p].includes(kw) && (year === '' || P.year[p] === +year) &&
+        (conf === '' || P.conference[p] === +conf)) found.push(p);
+  note.textContent += ` 找到 ${found.length} 篇论文` + (found.length > 200 ? '，显示前 200 篇。' : '。');
+  list.innerHTML = found.slice(0, 200).map(paperHtml).join('');
+}
+
+document.getElementById('summary').textContent =
+  `共 ${D.total_papers} 篇论文 · ${D.conferences.length} 个会议 · ${nKw} 个关键词 · 生成于 ${D.generated}`;
+['ov-year', 'pa-year'].forEach(id => fillSelect(id, D.years, yearLabel));
+['ov-conf', 'tr-conf', 'em-conf', 'pa-conf'].forEach(id => fillSelect(id, D.conferences, confLabel));
+document.getElementById('au-list').innerHTML = D.authors.map(a => `<option value="${esc(a.name)}">`).join('');
+document.getElementById('kw-list').innerHTML = D.keywords.map(k => `<option value="${esc(k)}">`).join('');
+if (D.authors.length) document.getElementById('au-name').value = D.authors[0].name;
+
+const renderers = {overview: renderOverview, trends: renderTrends, emerging: renderEmerging,
+                   authors: renderAuthor, papers: renderPapers};
+document.querySelectorAll('nav button').forEach(b => b.addEventListener('click', () => {
+  document.querySelectorAll('nav button, section').forEach(e => e.classList.remove('active'));
+  b.classList.add('active');
+  document.getElementById(b.dataset.view).classList.add('active');
+  renderers[b.dataset.view]();
+}));
+[['ov-year', renderOverview], ['ov-conf', renderOverview], ['ov-k', renderOverview],
+ ['tr-conf', renderTrends], ['tr-k', renderTrends], ['em-conf', renderEmerging],
+ ['au-name', renderAuthor], ['pa-kw', renderPapers], ['pa-year', renderPapers], ['pa-conf', renderPapers]]
+  .forEach(([id, fn]) => document.getElementById(id).addEventListener('change', fn));
+renderOverview();
+</script>
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    main()
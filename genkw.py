@@ -3,6 +3,7 @@ import logging
 from openai import OpenAI
 from dotenv import load_dotenv
 from data import read_papers_from_csv, save_papers_to_csv, PaperRecord
+from profiling import span, traced
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('ConfBot-GenKW')
@@ -30,6 +31,7 @@ def generate_prompt(keywords, title, abstract):
     return prompt
 
 
+@traced(cat='llm')
 def chat_with_llm(prompt):
     try:
         response = client.chat.completions.create(
@@ -47,6 +49,7 @@ def chat_with_llm(prompt):
         return None
 
 
+@traced(cat='llm')
 def assign_keywords(keywords, title, abstract):
     prompt = generate_prompt(keywords, title, abstract)
     while content := chat_with_llm(prompt):
@@ -54,18 +57,29 @@ def assign_keywords(keywords, title, abstract):
             return content
 
 
+def collect_keywords(papers):
+    keywords = set()
+    for paper in papers:
+        if paper.keyword:
+            kws = paper.keyword.split(',')
+            keywords.update(kws)
+    return list(keywords)
+
+
+def merge_keywords(keywords, new_keyword):
+    """Grow the shared keyword pool in place with the keywords of one paper."""
+    for kw in new_keyword.split(','):
+        if kw not in keywords:
+            keywords.append(kw)
+
+
 def batch_update_keywords(csv_path):
     logger.info(f"Reading {csv_path} ...")
     papers = read_papers_from_csv(csv_path)
     logger.info(f"Total records read: {len(papers)}")
 
     updated_count = 0
-    keywords = set()
-    for paper in papers:
-        if paper.keyword:
-            kws = paper.keyword.split(',')
-            keywords.update(kws)
-    keywords = list(keywords)
+    keywords = collect_keywords(papers)
     for index, paper in enumerate(papers):
         if paper.keyword and len(paper.keyword.strip()) > 0:
             continue
@@ -73,12 +87,10 @@ def batch_update_keywords(csv_path):
         logger.info(f"Generating keyword for ID {paper.id}...")
         
         try:
-            new_keyword = assign_keywords(keywords, paper.title, paper.abstract)
+            with span('paper', cat='llm', id=paper.id):
+                new_keyword = assign_keywords(keywords, paper.title, paper.abstract)
             paper.keyword = new_keyword
-            # keywords += new_keyword.split(',')
-            for kw in new_keyword.split(','):
-                if kw not in keywords:
-                    keywords.append(kw)
+            merge_keywords(keywords, new_keyword)
             updated_count += 1
             
             if updated_count % 10 == 0:
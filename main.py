@@ -3,6 +3,8 @@ import logging
 
 from crawler import crawler_papers
 from data import from_meta_to_csv
+import profiling
+from profiling import span
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("ConfBot-Main")
@@ -41,26 +43,122 @@ logger.setLevel(logging.DEBUG)
     help="Path for save the meta information",
     show_default=True,
 )
-def main(urls, keyword, crawler, retry, metasave):
+@click.option(
+    "--stream/--no-stream",
+    default=False,
+    type=click.BOOL,
+    help="Generate keywords and save papers while the crawler is still running",
+    show_default=True,
+)
+@click.option(
+    "--queue-size",
+    default=32,
+    type=click.IntRange(min=1),
+    help="Max papers buffered between streaming stages",
+    show_default=True,
+)
+@click.option(
+    "--workers",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of concurrent keyword generators in streaming mode",
+    show_default=True,
+)
+@click.option(
+    "--index/--no-index",
+    default=True,
+    type=click.BOOL,
+    help="Build the full-text search index after saving the papers",
+    show_default=True,
+)
+@click.option(
+    "--related/--no-related",
+    default=False,
+    type=click.BOOL,
+    help="Precompute the related papers of every paper for the dashboard",
+    show_default=True,
+)
+@click.option(
+    "--profile/--no-profile",
+    default=False,
+    type=click.BOOL,
+    help="Record timing spans for every stage and paper and print a summary",
+    show_default=True,
+)
+@click.option(
+    "--profile-out",
+    default="profile.json",
+    help="Chrome trace-event file written in profile mode (open in chrome://tracing or Perfetto)",
+    show_default=True,
+)
+@click.option(
+    "--cprofile/--no-cprofile",
+    default=False,
+    type=click.BOOL,
+    help="In profile mode, also run each stage under cProfile and save the .prof stats",
+    show_default=True,
+)
+def main(urls, keyword, crawler, retry, metasave, stream, queue_size, workers, index, related,
+         profile, profile_out, cprofile):
+    if profile:
+        tracer = profiling.enable(cprofile=cprofile)
+        try:
+            with span("main"):
+                run(urls, keyword, crawler, retry, metasave, stream, queue_size, workers, index, related)
+        finally:
+            profiling.disable()
+            tracer.write(profile_out)
+            click.echo(tracer.summary())
+    else:
+        run(urls, keyword, crawler, retry, metasave, stream, queue_size, workers, index, related)
+
+
+def run(urls, keyword, crawler, retry, metasave, stream, queue_size, workers, index, related):
     urls = urls.split(",")
-    if crawler:
+    if stream and crawler:
+        from pipeline import run_pipeline
+
+        with span("pipeline", profile=True):
+            run_pipeline(
+                urls,
+                metasave,
+                keyword=keyword,
+                retry=retry,
+                queue_size=queue_size,
+                workers=workers,
+            )
+    elif crawler:
         for url in urls:
             logging.info(f"Start crawler for {url}...")
             result = []
             for i in range(retry):
-                result = crawler_papers(url)
+                with span("crawl", profile=True, url=url, attempt=i + 1):
+                    result = crawler_papers(url)
                 if result:
                     logger.info("Success")
                     break
                 logger.info(f"Failed, retry (remain {retry - i - 1} times)")
             if result:
-                from_meta_to_csv(metasave, url, result)
+                with span("save", profile=True, url=url):
+                    from_meta_to_csv(metasave, url, result)
             else:
                 logger.info(f"Skip saving because crawler failed for {url}")
     if keyword:
+        # In streaming mode this only picks up papers whose tagging failed.
         from genkw import batch_update_keywords
 
-        batch_update_keywords(metasave)
+        with span("keywords", profile=True):
+            batch_update_keywords(metasave)
+    if index:
+        from search import update_search_index
+
+        with span("index", profile=True):
+            update_search_index(metasave)
+    if related:
+        from similarity import update_related_papers
+
+        with span("related", profile=True):
+            update_related_papers(metasave)
 
 
 if __name__ == "__main__":
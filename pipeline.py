@@ -0,0 +1,165 @@
+import logging
+import queue
+import threading
+from typing import List
+
+from crawler import iter_crawler_papers
+from data import (
+    PaperRecord,
+    append_papers_to_csv,
+    load_existing_titles,
+    parse_conf_year,
+    read_papers_from_csv,
+)
+from profiling import span
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ConfBot-Pipeline")
+logger.setLevel(logging.DEBUG)
+
+# Marks the end of a stage's output; every consumer receives exactly one.
+_DONE = object()
+
+
+def crawl_stage(urls, retry, titles, next_id, out_queue, consumers):
+    """Crawl every url and push new, de-duplicated records downstream."""
+    try:
+        for url in urls:
+            conf, year = parse_conf_year(url)
+            logger.info(f"Start crawler for {url} (Conf: {conf}, Year: {year})...")
+            for i in range(retry):
+                seen = 0
+                failed = False
+                try:
+                    with span("crawl_url", profile=True, url=url, attempt=i + 1):
+                        for meta in iter_crawler_papers(url):
+                            seen += 1
+                            if meta.title in titles:
+                                continue
+                            titles.add(meta.title)
+                            record = PaperRecord(
+                                id=next_id,
+                                conference=conf,
+                                year=year,
+                                title=meta.title,
+                                authors=meta.authors,
+                                abstract=meta.abstract,
+                            )
+                            next_id += 1
+                            # Blocks while downstream is busy: this is the backpressure.
+                            with span("queue_put", cat="queue"):
+                                out_queue.put(record)
+                except Exception as e:
+                    # Retry even after a partial crawl: papers already sent are skipped by title
+                    logger.error(f"Crawler error for {url}: {e}")
+                    failed = True
+                if seen and not failed:
+                    logger.info(f"Success, {seen} papers streamed from {url}")
+                    break
+                logger.info(f"Failed, retry (remain {retry - i - 1} times)")
+            else:
+                logger.info(f"Skip {url} because crawler failed")
+    finally:
+        for _ in range(consumers):
+            out_queue.put(_DONE)
+
+
+def tag_stage(keywords, lock, in_queue, out_queue):
+    """Assign keywords to each record while the crawler keeps running."""
+    from genkw import assign_keywords, merge_keywords
+
+    while True:
+        with span("queue_get", cat="queue"):
+            record = in_queue.get()
+        if record is _DONE:
+            out_queue.put(_DONE)
+            return
+        logger.info(f"Generating keyword for ID {record.id}...")
+        try:
+            with lock:
+                pool = list(keywords)
+            with span("tag_paper", cat="llm", profile=True, id=record.id):
+                new_keyword = assign_keywords(pool, record.title, record.abstract)
+            with lock:
+                merge_keywords(keywords, new_keyword)
+            record.keyword = new_keyword
+        except Exception as e:
+            # Left empty so that batch_update_keywords can retry it later.
+            logger.error(f"Error generating for ID {record.id}: {e}")
+        out_queue.put(record)
+
+
+def write_stage(path, in_queue, producers, flush_every):
+    """Append records to the CSV in small batches; return how many were written."""
+    pending: List[PaperRecord] = []
+    written = 0
+    remaining = producers
+    while remaining:
+        try:
+            with span("queue_get", cat="queue"):
+                record = in_queue.get(timeout=1)
+        except queue.Empty:
+            record = None
+        if record is _DONE:
+            remaining -= 1
+        elif record is not None:
+            pending.append(record)
+        if pending and (record is None or len(pending) >= flush_every or not remaining):
+            append_papers_to_csv(path, pending)
+            written += len(pending)
+            logger.info(f"--> Saved {written} new papers so far")
+            pending = []
+    return written
+
+
+def run_pipeline(urls, path, keyword=True, retry=3, queue_size=32, workers=1, flush_every=10):
+    """
+    Crawl, tag and store papers concurrently.
+
+    Stages are connected by bounded queues, so a fast crawler waits for the
+    keyword generator instead of buffering the whole conference in memory,
+    and the total time is close to the slower stage rather than the sum.
+    """
+    if workers < 1 or queue_size < 1:
+        # Without a tag worker the crawler would block forever on the full queue
+        raise ValueError("workers and queue_size must be at least 1")
+    titles, next_id = load_existing_titles(path)
+    write_queue = queue.Queue(maxsize=queue_size)
+    threads = []
+
+    if keyword:
+        from genkw import collect_keywords
+
+        keywords = collect_keywords(read_papers_from_csv(path))
+        lock = threading.Lock()
+        tag_queue = queue.Queue(maxsize=queue_size)
+        threads.append(threading.Thread(
+            target=crawl_stage,
+            args=(urls, retry, titles, next_id, tag_queue, workers),
+            name="crawl",
+            daemon=True,
+        ))
+        for i in range(workers):
+            threads.append(threading.Thread(
+                target=tag_stage,
+                args=(keywords, lock, tag_queue, write_queue),
+                name=f"tag-{i}",
+                daemon=True,
+            ))
+        producers = workers
+    else:
+        threads.append(threading.Thread(
+            target=crawl_stage,
+            args=(urls, retry, titles, next_id, write_queue, 1),
+            name="crawl",
+            daemon=True,
+        ))
+        producers = 1
+
+    for thread in threads:
+        thread.start()
+    written = write_stage(path, write_queue, producers, flush_every)
+    for thread in threads:
+        thread.join()
+    logger.info(f"Pipeline finished. Add {written}")
+    return written
@@ -0,0 +1,175 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('ConfBot-Profile')
+logger.setLevel(logging.DEBUG)
+
+# The active tracer; None keeps every span a shared no-op context manager.
+_tracer: Optional['Tracer'] = None
+_NULL_SPAN = nullcontext()
+
+
+class Tracer:
+    """
+    Nested timing spans for a main.py run.
+
+    Every span becomes a Chrome trace "complete" event on its thread, so the
+    trace opens in chrome://tracing or https://ui.perfetto.dev as one lane
+    per pipeline stage. Spans opened with ``profile=True`` are also run under
+    cProfile (unless their thread is already being profiled), and the stats
+    are merged per span name.
+    """
+
+    def __init__(self, cprofile: bool = False):
+        self.cprofile = cprofile
+        self.events = []
+        self.stats = {}
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._threads = {}
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+            thread = threading.current_thread()
+            with self._lock:
+                self._threads[thread.ident] = thread.name
+        return stack
+
+    @contextmanager
+    def span(self, name: str, cat: str = 'stage', profile: bool = False, **args):
+        stack = self._stack()
+        # [child time, profiling] of the open span, so that self time can be reported
+        frame = [0, False]
+        profiler = None
+        if profile and self.cprofile and not any(f[1] for f in stack):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                frame[1] = True
+            except ValueError as e:
+                # Another profiler (e.g. a debugger) already owns this thread
+                logger.debug(f"Skip cProfile for {name}: {e}")
+                profiler = None
+        stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            if profiler is not None:
+                profiler.disable()
+            stack.pop()
+            if stack:
+                stack[-1][0] += duration
+            event = {
+                'name': name,
+                'cat': cat,
+                'ph': 'X',
+                'ts': (start - self._origin) / 1000,
+                'dur': duration / 1000,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'self': (duration - frame[0]) / 1000,
+            }
+            if args:
+                event['args'] = {key: str(value) for key, value in args.items()}
+            with self._lock:
+                self.events.append(event)
+                if profiler is not None:
+                    if name in self.stats:
+                        self.stats[name].add(profiler)
+                    else:
+                        self.stats[name] = pstats.Stats(profiler)
+
+    def chrome_trace(self) -> dict:
+        with self._lock:
+            events = [{k: v for k, v in event.items() if k != 'self'} for event in self.events]
+            threads = dict(self._threads)
+        events.extend({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+                       'args': {'name': name}} for tid, name in threads.items())
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, path: str):
+        """Write the Chrome trace to ``path`` and the cProfile stats next to it."""
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.chrome_trace(), f)
+        except IOError as e:
+            logger.error(f"Failed to write trace {e}")
+            return
+        logger.info(f"Trace written to {path}")
+        root, _ = os.path.splitext(path)
+        for name, stats in self.stats.items():
+            stats_path = f"{root}.{name}.prof"
+            stats.dump_stats(stats_path)
+            logger.info(f"cProfile stats of {name} written to {stats_path}")
+
+    def summary(self, top_functions: int = 10) -> str:
+        """Per span name: calls, total / self / mean / max time, slowest first."""
+        rows = {}
+        with self._lock:
+            for event in self.events:
+                row = rows.setdefault((event['cat'], event['name']), [0, 0.0, 0.0, 0.0])
+                row[0] += 1
+                row[1] += event['dur']
+                row[2] += event['self']
+                row[3] = max(row[3], event['dur'])
+        lines = [f"{'category':<10} {'span':<28} {'calls':>7} {'total s':>10} {'self s':>10} "
+                 f"{'mean ms':>10} {'max ms':>10}"]
+        for (cat, name), (calls, total, own, longest) in sorted(rows.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{cat:<10} {name:<28} {calls:>7} {total / 1e6:>10.3f} {own / 1e6:>10.3f} "
+                         f"{total / calls / 1e3:>10.2f} {longest / 1e3:>10.2f}")
+        for name, stats in self.stats.items():
+            out = io.StringIO()
+            stats.stream = out
+            stats.sort_stats('tottime').print_stats(top_functions)
+            lines.append(f"\ncProfile of {name} (top {top_functions} by own time):")
+            lines.append(out.getvalue().strip())
+        return '\n'.join(lines)
+
+
+def enable(cprofile: bool = False) -> Tracer:
+    global _tracer
+    _tracer = Tracer(cprofile=cprofile)
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def span(name: str, cat: str = 'stage', profile: bool = False, **args):
+    """Time a block when profiling is enabled; a no-op otherwise."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, cat, profile, **args)
+
+
+def traced(name: Optional[str] = None, cat: str = 'stage', profile: bool = False):
+    """Decorator form of ``span`` (not for generator functions, whose body runs lazily)."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(span_name, cat, profile):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
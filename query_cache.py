@@ -0,0 +1,122 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def estimate_size(value, shared=()):
+    """
+    粗略估计查询结果占用的字节数，用于控制缓存总大小
+    shared: 分析器本身持有的对象 (如 raw_df)，结果直接返回它们时不额外占用内存，不计入
+    """
+    if any(value is obj for obj in shared):
+        return 0
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(v, shared) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k, shared) + estimate_size(v, shared)
+                                          for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+def make_key(value):
+    """
+    把查询参数转为可哈希的键
+    DataFrame / Series 参数 (如 df_scope) 只用来圈定论文范围，分析器只读取其索引，
+    且键中已带数据版本，因此以索引值的摘要表示，不哈希整表内容 (摘要列很大)；
+    ndarray 以 (形状, 类型, 字节) 表示
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        index = value.index
+        if index.dtype.kind in 'iub':
+            data = index.to_numpy().tobytes()
+        else:
+            data = pd.util.hash_pandas_object(index, index=False).to_numpy().tobytes()
+        return ('frame', len(index), index.dtype.str, hashlib.blake2b(data, digest_size=16).digest())
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            # object 数组的字节是指针，只能逐个元素取键
+            return ('array', value.shape, tuple(make_key(v) for v in value.ravel()))
+        return ('array', value.shape, value.dtype.str, value.tobytes())
+    if isinstance(value, (list, tuple)):
+        return tuple(make_key(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, make_key(v)) for k, v in value.items()))
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class QueryCache:
+    """
+    按内存大小限制的 LRU 缓存，线程安全，可在多个看板会话之间共享
+    注意：缓存的结果对象是共享的，调用方不应原地修改
+    """
+
+    def __init__(self, max_bytes=256 * 2**20):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute, shared=()):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+        # 计算在锁外进行，不阻塞其它会话的命中
+        value = compute()
+        size = estimate_size(value, shared)
+        with self._lock:
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (value, size)
+                self.total_bytes += size
+                while self.total_bytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self.total_bytes -= evicted
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CachedAnalyzer:
+    """
+    PaperAnalyzer 的代理：get_* 查询按 (数据版本, 方法名, 参数) 记忆化
+    其余属性直接转发给分析器
+    """
+
+    def __init__(self, analyzer, cache, version):
+        self._analyzer = analyzer
+        self._cache = cache
+        self._version = version
+
+    def __getattr__(self, name):
+        attr = getattr(self._analyzer, name)
+        if not name.startswith('get_') or not callable(attr):
+            return attr
+
+        def cached(*args, **kwargs):
+            key = (self._version, name, make_key(args), make_key(kwargs))
+            return self._cache.get_or_compute(key, lambda: attr(*args, **kwargs),
+                                              shared=(self._analyzer.raw_df,))
+
+        return cached
@@ -0,0 +1,222 @@
+import os
+import re
+import logging
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from sparse import CSRMatrix
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('ConfBot-Search')
+logger.setLevel(logging.DEBUG)
+
+# Runs of Unicode letters and digits. Scripts written without spaces (e.g.
+# Chinese) become one token per run, so they only match whole runs.
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+STOPWORDS = frozenset('''
+a an and are as at be been but by can for from has have in into is it its of on or our
+that the their these this those to via was we were which while with within without
+'''.split())
+# A title term counts as much as this many abstract terms.
+TITLE_BOOST = 2.0
+# Bumped whenever tokenization or weighting changes; older files are rebuilt.
+INDEX_VERSION = 2
+
+
+def tokenize(text) -> list:
+    if not isinstance(text, str) or not text:
+        return []
+    return [t for t in TOKEN_PATTERN.findall(text.casefold()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def text_hashes(*columns) -> np.ndarray:
+    """One uint64 per document over the given text columns (missing values count as '')."""
+    hashes = None
+    for column in columns:
+        values = np.asarray([v if isinstance(v, str) else '' for v in column], dtype=object)
+        column_hashes = pd.util.hash_array(values, categorize=False)
+        hashes = column_hashes if hashes is None else (hashes * np.uint64(0x100000001B3)) ^ column_hashes
+    return hashes
+
+
+def index_path(path: str) -> str:
+    root, _ = os.path.splitext(path)
+    return root + '.search.npz'
+
+
+class SearchIndex:
+    """
+    BM25 inverted index over paper titles and abstracts.
+
+    Terms are kept sorted so a query term is found by binary search, and the
+    postings are a term x document CSR matrix of (boosted) term frequencies.
+    A query only touches the postings of its own terms, never the whole corpus.
+    Documents are the CSV rows in order; ``paper_ids`` and ``doc_hashes`` (a
+    hash of each paper's title and abstract) let the dashboard tell whether a
+    persisted index still matches the data.
+    """
+
+    def __init__(self, terms, postings: CSRMatrix, doc_len, paper_ids, doc_hashes=None, k1=1.2, b=0.75):
+        self.terms = np.asarray(terms, dtype=object)
+        self.postings = postings
+        self.doc_len = np.asarray(doc_len, dtype=np.float32)
+        self.paper_ids = np.asarray(paper_ids, dtype=np.int64)
+        self.doc_hashes = None if doc_hashes is None else np.asarray(doc_hashes, dtype=np.uint64)
+        self.k1 = k1
+        self.b = b
+        self.avg_len = float(self.doc_len.mean()) if len(self.doc_len) and self.doc_len.sum() else 1.0
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.paper_ids)
+
+    @staticmethod
+    def _tokens(titles: Sequence, abstracts: Sequence, offset: int = 0):
+        """Flatten all documents into parallel (term, doc, weight) arrays."""
+        terms, docs, weights = [], [], []
+        for doc, (title, abstract) in enumerate(zip(titles, abstracts), start=offset):
+            title_tokens, abstract_tokens = tokenize(title), tokenize(abstract)
+            terms.extend(title_tokens)
+            terms.extend(abstract_tokens)
+            docs.extend([doc] * (len(title_tokens) + len(abstract_tokens)))
+            weights.extend([TITLE_BOOST] * len(title_tokens))
+            weights.extend([1.0] * len(abstract_tokens))
+        return (np.asarray(terms, dtype=object), np.asarray(docs, dtype=np.int64),
+                np.asarray(weights, dtype=np.float32))
+
+    @classmethod
+    def build(cls, paper_ids, titles, abstracts) -> 'SearchIndex':
+        terms, docs, weights = cls._tokens(titles, abstracts)
+        codes, vocab = pd.factorize(terms, sort=True)
+        n_docs = len(paper_ids)
+        postings = CSRMatrix.from_coo(codes, docs, weights, shape=(len(vocab), n_docs), dtype=np.float32)
+        doc_len = np.bincount(docs, weights=weights, minlength=n_docs)
+        return cls(np.asarray(vocab, dtype=object), postings, doc_len, paper_ids,
+                   text_hashes(titles, abstracts))
+
+    def extend(self, paper_ids, titles, abstracts) -> 'SearchIndex':
+        """
+        Return a new index with documents appended (this one is not modified).
+        Only the new documents are tokenized; the existing postings are carried
+        over by remapping their term codes into the merged vocabulary.
+        """
+        new_terms, new_docs, new_weights = self._tokens(titles, abstracts, offset=self.n_docs)
+        vocab = np.union1d(self.terms, np.unique(new_terms)).astype(object)
+        old_codes = np.searchsorted(vocab, self.terms).astype(np.int64)[self.postings.row_ids()]
+        new_codes = np.searchsorted(vocab, new_terms).astype(np.int64)
+        paper_ids = np.concatenate([self.paper_ids, np.asarray(paper_ids, dtype=np.int64)])
+        postings = CSRMatrix.from_coo(np.concatenate([old_codes, new_codes]),
+                                      np.concatenate([self.postings.indices, new_docs]),
+                                      np.concatenate([self.postings.data, new_weights]),
+                                      shape=(len(vocab), len(paper_ids)), dtype=np.float32)
+        doc_len = np.concatenate([self.doc_len, np.bincount(new_docs - self.n_docs, weights=new_weights,
+                                                            minlength=len(titles))])
+        doc_hashes = None if self.doc_hashes is None else \
+            np.concatenate([self.doc_hashes, text_hashes(titles, abstracts)])
+        return SearchIndex(vocab, postings, doc_len, paper_ids, doc_hashes, self.k1, self.b)
+
+    def is_fresh(self, paper_ids, doc_hashes) -> bool:
+        """Same papers in the same order, with unchanged titles and abstracts."""
+        return self.doc_hashes is not None \
+            and np.array_equal(self.paper_ids, np.asarray(paper_ids, dtype=np.int64)) \
+            and np.array_equal(self.doc_hashes, np.asarray(doc_hashes, dtype=np.uint64))
+
+    def term_ids(self, query: str) -> np.ndarray:
+        tokens = np.asarray(sorted(set(tokenize(query))), dtype=object)
+        if not len(tokens) or not len(self.terms):
+            return np.array([], dtype=np.int64)
+        pos = np.searchsorted(self.terms, tokens)
+        pos = np.minimum(pos, len(self.terms) - 1)
+        return pos[self.terms[pos] == tokens]
+
+    def search(self, query: str, top_k: int = 20, doc_mask: Optional[np.ndarray] = None):
+        """
+        Rank documents for ``query`` with BM25.
+
+        doc_mask: optional boolean filter over documents (e.g. a conference).
+        Returns (docs, scores) sorted by descending score.
+        """
+        tids = self.term_ids(query)
+        if not len(tids):
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        starts, ends = self.postings.indptr[tids], self.postings.indptr[tids + 1]
+        lengths = ends - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        docs = self.postings.indices[positions]
+        tf = self.postings.data[positions]
+
+        df = lengths.astype(np.float32)
+        idf = np.log1p((self.n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+        norm = self.k1 * (1 - self.b + self.b * self.doc_len[docs] / self.avg_len)
+        contrib = np.repeat(idf, lengths) * tf * (self.k1 + 1) / (tf + norm)
+
+        candidates, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=contrib).astype(np.float32)
+        if doc_mask is not None:
+            keep = np.asarray(doc_mask, dtype=bool)[candidates]
+            candidates, scores = candidates[keep], scores[keep]
+        if top_k is not None and len(scores) > top_k:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            candidates, scores = candidates[best], scores[best]
+        order = np.lexsort((candidates, -scores))
+        return candidates[order], scores[order]
+
+    def save(self, path: str):
+        try:
+            blob = '\n'.join(self.terms.tolist()).encode('utf-8')
+            with open(path, 'wb') as f:
+                np.savez(f, terms=np.frombuffer(blob, dtype=np.uint8),
+                         indptr=self.postings.indptr, indices=self.postings.indices,
+                         data=self.postings.data, doc_len=self.doc_len, paper_ids=self.paper_ids,
+                         doc_hashes=self.doc_hashes if self.doc_hashes is not None else np.zeros(0, dtype=np.uint64),
+                         version=INDEX_VERSION)
+        except IOError as e:
+            logger.error(f"Failed to save search index {e}")
+
+    @classmethod
+    def load(cls, path: str) -> Optional['SearchIndex']:
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as f:
+                if 'version' not in f or int(f['version']) != INDEX_VERSION:
+                    logger.info("Search index was written by an older version. It will be rebuilt.")
+                    return None
+                blob = f['terms'].tobytes().decode('utf-8')
+                terms = blob.split('\n') if blob else []
+                postings = CSRMatrix(f['indptr'], f['indices'], f['data'],
+                                     (len(terms), len(f['paper_ids'])))
+                return cls(terms, postings, f['doc_len'], f['paper_ids'], f['doc_hashes'])
+        except Exception as e:
+            logger.info(f"Failed to read search index {e}. It will be rebuilt.")
+            return None
+
+
+def update_search_index(path: str):
+    """
+    Bring the index next to ``path`` up to date after an ingest: append the
+    new rows when the CSV only grew, otherwise rebuild it.
+    """
+    from data import read_papers_from_csv
+
+    papers = read_papers_from_csv(path)
+    if not papers:
+        return
+    ids = [paper.id for paper in papers]
+    titles = [paper.title for paper in papers]
+    abstracts = [paper.abstract for paper in papers]
+    hashes = text_hashes(titles, abstracts)
+    target = index_path(path)
+    index = SearchIndex.load(target)
+    if index is not None and index.is_fresh(ids, hashes):
+        return
+    n_old = index.n_docs if index is not None else 0
+    if index is not None and n_old < len(ids) and index.is_fresh(ids[:n_old], hashes[:n_old]):
+        logger.info(f"Add {len(ids) - n_old} papers to the search index...")
+        index = index.extend(ids[n_old:], titles[n_old:], abstracts[n_old:])
+    else:
+        logger.info("Build the search index...")
+        index = SearchIndex.build(ids, titles, abstracts)
+    index.save(target)
@@ -0,0 +1,252 @@
+import os
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from data import split_values
+from sparse import CSRMatrix
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('ConfBot-Similarity')
+logger.setLevel(logging.DEBUG)
+
+# Share of the similarity score that comes from shared LLM keywords.
+KEYWORD_WEIGHT = 0.3
+# Only a query paper's highest weighted terms are matched; they carry most
+# of its TF-IDF mass and have the shortest postings.
+MAX_QUERY_TERMS = 32
+BATCH_SIZE = 32
+
+
+def related_path(path: str) -> str:
+    root, _ = os.path.splitext(path)
+    return root + '.related.npz'
+
+
+def keyword_incidence(keywords) -> CSRMatrix:
+    """Paper x keyword 0/1 matrix from raw keyword cells."""
+    rows, values = [], []
+    for row, cell in enumerate(keywords):
+        for keyword in split_values(cell):
+            rows.append(row)
+            values.append(keyword)
+    codes, names = pd.factorize(np.asarray(values, dtype=object))
+    return CSRMatrix.from_coo(rows, codes, shape=(len(keywords), len(names))).binarize()
+
+
+def _normalized(matrix: CSRMatrix, weights) -> CSRMatrix:
+    """Scale each row of ``matrix`` (with ``weights`` as data) to unit L2 norm."""
+    weights = np.asarray(weights, dtype=np.float32)
+    norms = np.sqrt(np.bincount(matrix.row_ids(), weights=weights.astype(np.float64) ** 2,
+                                minlength=matrix.shape[0])).astype(np.float32)
+    norms[norms == 0] = 1
+    return CSRMatrix(matrix.indptr, matrix.indices, weights / norms[matrix.row_ids()], matrix.shape)
+
+
+def _top_per_row(matrix: CSRMatrix, limit: int) -> CSRMatrix:
+    """Keep only the ``limit`` largest values of every row (values must lie in [0, 1])."""
+    row_ids = matrix.row_ids()
+    # One float key instead of a two-key lexsort: row first, then descending value
+    order = np.argsort(row_ids * 2.0 - matrix.data)
+    rank = np.arange(matrix.nnz) - matrix.indptr[row_ids[order]]
+    keep = np.sort(order[rank < limit])
+    return CSRMatrix.from_coo(row_ids[keep], matrix.indices[keep], matrix.data[keep],
+                              matrix.shape, dtype=matrix.data.dtype)
+
+
+class SimilarityIndex:
+    """
+    "Related papers" over TF-IDF vectors of titles and abstracts, optionally
+    blended with the papers' LLM keywords.
+
+    The vectors come from the BM25 postings of ``search.SearchIndex``, so no
+    text is tokenized again. Everything is float32 CSR: term_docs holds the
+    unit-length vector of every paper (by term), and doc_terms only the
+    strongest terms of each paper, which are what a query walks. Scores for a batch of papers are accumulated into one
+    dense (batch x papers) block with a single bincount, and the top-k is
+    taken with argpartition.
+    """
+
+    def __init__(self, doc_terms: CSRMatrix, term_docs: CSRMatrix,
+                 doc_keywords: Optional[CSRMatrix] = None, keyword_docs: Optional[CSRMatrix] = None,
+                 keyword_weight: float = KEYWORD_WEIGHT):
+        self.doc_terms = doc_terms
+        self.term_docs = term_docs
+        self.doc_keywords = doc_keywords
+        self.keyword_docs = keyword_docs
+        self.keyword_weight = keyword_weight if doc_keywords is not None else 0.0
+
+    @property
+    def n_docs(self) -> int:
+        return self.doc_terms.shape[0]
+
+    @classmethod
+    def from_search_index(cls, search_index, kw_incidence: Optional[CSRMatrix] = None,
+                          keyword_weight: float = KEYWORD_WEIGHT,
+                          max_query_terms: int = MAX_QUERY_TERMS) -> 'SimilarityIndex':
+        postings = search_index.postings
+        n_docs = postings.shape[1]
+        df = np.diff(postings.indptr).astype(np.float32)
+        idf = np.log((n_docs + 1) / (df + 1)) + 1
+        weights = (1 + np.log(postings.data)) * idf[postings.row_ids()]
+        # Transpose to paper x term, then give every paper a unit-length vector
+        doc_terms = CSRMatrix(postings.indptr, postings.indices, weights, postings.shape).transpose()
+        doc_terms = _normalized(doc_terms, doc_terms.data)
+        term_docs = doc_terms.transpose()
+        doc_keywords = keyword_docs = None
+        if kw_incidence is not None and kw_incidence.nnz:
+            doc_keywords = _normalized(kw_incidence, np.ones(kw_incidence.nnz, dtype=np.float32))
+            keyword_docs = doc_keywords.transpose()
+        return cls(_top_per_row(doc_terms, max_query_terms), term_docs,
+                   doc_keywords, keyword_docs, keyword_weight)
+
+    @staticmethod
+    def _query(matrix: CSRMatrix, rows):
+        """The nonzeros of ``rows`` as parallel (query, column, weight) arrays."""
+        queries, cols, weights = [], [], []
+        for i, row in enumerate(rows):
+            row_cols, row_data = matrix.row(row)
+            queries.append(np.full(len(row_cols), i, dtype=np.int64))
+            cols.append(row_cols)
+            weights.append(row_data)
+        return np.concatenate(queries), np.concatenate(cols), np.concatenate(weights)
+
+    @staticmethod
+    def _accumulate(queries, cols, weights, postings: CSRMatrix, n_queries):
+        """Dense (queries x papers) block of sum(weight * postings[col])."""
+        starts = postings.indptr[cols]
+        lengths = postings.indptr[cols + 1] - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        flat = np.repeat(queries, lengths) * postings.shape[1] + postings.indices[positions]
+        values = np.repeat(weights, lengths) * postings.data[positions]
+        # With no postings (papers without any token) bincount returns int64; callers scale in place
+        block = np.bincount(flat, weights=values, minlength=n_queries * postings.shape[1])
+        return block.astype(np.float64, copy=False).reshape(n_queries, postings.shape[1])
+
+    def scores(self, rows) -> np.ndarray:
+        """Blended cosine similarity of each paper in ``rows`` to every paper."""
+        rows = np.asarray(rows, dtype=np.int64)
+        block = self._accumulate(*self._query(self.doc_terms, rows),
+                                 self.term_docs, len(rows))
+        if self.keyword_weight:
+            block *= 1 - self.keyword_weight
+            block += self.keyword_weight * self._accumulate(
+                *self._query(self.doc_keywords, rows), self.keyword_docs, len(rows))
+        return block.astype(np.float32)
+
+    def related_batch(self, rows, top_k: int = 10):
+        """
+        Top-k most similar papers for every paper in ``rows`` (itself excluded).
+        Returns (neighbors, scores), both (len(rows) x top_k); missing
+        neighbors are -1 with score 0.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        neighbors = np.full((len(rows), top_k), -1, dtype=np.int32)
+        scores = np.zeros((len(rows), top_k), dtype=np.float32)
+        k = min(top_k, self.n_docs - 1)
+        if not len(rows) or k <= 0:
+            return neighbors, scores
+        block = self.scores(rows)
+        block[np.arange(len(rows)), rows] = 0
+        best = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(block, best, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind='stable')
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        found = best_scores > 0
+        neighbors[:, :k] = np.where(found, best, -1)
+        scores[:, :k] = np.where(found, best_scores, 0)
+        return neighbors, scores
+
+    def related(self, row: int, top_k: int = 10):
+        neighbors, scores = self.related_batch([row], top_k)
+        keep = neighbors[0] >= 0
+        return neighbors[0][keep], scores[0][keep]
+
+    def all_neighbors(self, top_k: int = 10, batch_size: int = BATCH_SIZE):
+        neighbors = np.full((self.n_docs, top_k), -1, dtype=np.int32)
+        scores = np.zeros((self.n_docs, top_k), dtype=np.float32)
+        for start in range(0, self.n_docs, batch_size):
+            rows = np.arange(start, min(start + batch_size, self.n_docs))
+            neighbors[rows], scores[rows] = self.related_batch(rows, top_k)
+        return neighbors, scores
+
+
+class NeighborTable:
+    """
+    Precomputed top-k related papers per CSV row, written at ingest.
+    ``doc_hashes`` (see ``search.text_hashes``) covers each paper's title,
+    abstract and keywords, so an edited paper invalidates the table.
+    """
+
+    def __init__(self, neighbors, scores, paper_ids, doc_hashes=None):
+        self.neighbors = np.asarray(neighbors, dtype=np.int32)
+        self.scores = np.asarray(scores, dtype=np.float32)
+        self.paper_ids = np.asarray(paper_ids, dtype=np.int64)
+        self.doc_hashes = None if doc_hashes is None else np.asarray(doc_hashes, dtype=np.uint64)
+
+    @property
+    def top_k(self) -> int:
+        return self.neighbors.shape[1]
+
+    def is_fresh(self, paper_ids, doc_hashes) -> bool:
+        return self.doc_hashes is not None \
+            and np.array_equal(self.paper_ids, np.asarray(paper_ids, dtype=np.int64)) \
+            and np.array_equal(self.doc_hashes, np.asarray(doc_hashes, dtype=np.uint64))
+
+    def related(self, row: int, top_k: int = 10):
+        neighbors, scores = self.neighbors[row, :top_k], self.scores[row, :top_k]
+        keep = neighbors >= 0
+        return neighbors[keep], scores[keep]
+
+    def save(self, path: str):
+        try:
+            with open(path, 'wb') as f:
+                np.savez(f, neighbors=self.neighbors, scores=self.scores, paper_ids=self.paper_ids,
+                         doc_hashes=self.doc_hashes if self.doc_hashes is not None
+                         else np.zeros(0, dtype=np.uint64))
+        except IOError as e:
+            logger.error(f"Failed to save related papers {e}")
+
+    @classmethod
+    def load(cls, path: str) -> Optional['NeighborTable']:
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as f:
+                # Tables written before doc_hashes existed are never fresh
+                return cls(f['neighbors'], f['scores'], f['paper_ids'],
+                           f['doc_hashes'] if 'doc_hashes' in f else None)
+        except Exception as e:
+            logger.info(f"Failed to read related papers {e}.")
+            return None
+
+
+def update_related_papers(path: str, top_k: int = 10):
+    """
+    Precompute the related papers of every paper in ``path`` (after the
+    search index has been refreshed) so the dashboard can look them up.
+    """
+    from data import read_papers_from_csv
+    from search import SearchIndex, index_path, text_hashes, update_search_index
+
+    papers = read_papers_from_csv(path)
+    if not papers:
+        return
+    ids = [paper.id for paper in papers]
+    hashes = text_hashes([paper.title for paper in papers], [paper.abstract for paper in papers],
+                         [paper.keyword for paper in papers])
+    table = NeighborTable.load(related_path(path))
+    if table is not None and table.is_fresh(ids, hashes) and table.top_k >= top_k:
+        return
+    update_search_index(path)
+    search_index = SearchIndex.load(index_path(path))
+    if search_index is None:
+        return
+    logger.info(f"Compute related papers for {len(papers)} papers...")
+    similarity = SimilarityIndex.from_search_index(
+        search_index, keyword_incidence([paper.keyword for paper in papers]))
+    neighbors, scores = similarity.all_neighbors(top_k)
+    NeighborTable(neighbors, scores, ids, hashes).save(related_path(path))
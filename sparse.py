@@ -0,0 +1,136 @@
+import numpy as np
+
+
+class CSRMatrix:
+    """
+    只依赖 numpy 的最小 CSR 稀疏矩阵
+    indptr / indices / data 与 scipy.sparse.csr_matrix 的含义一致，
+    乘法、转置、按行按列求和全部是向量化实现，没有 Python 层的逐元素循环。
+    """
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data)
+        self.shape = (int(shape[0]), int(shape[1]))
+        self._row_ids = None
+
+    @classmethod
+    def from_coo(cls, rows, cols, data=None, shape=None, dtype=np.int64):
+        """由 (行, 列, 值) 三元组构建，重复位置的值会被累加"""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        data = np.ones(len(rows), dtype=dtype) if data is None else np.asarray(data, dtype=dtype)
+        if shape is None:
+            shape = (int(rows.max()) + 1 if len(rows) else 0, int(cols.max()) + 1 if len(cols) else 0)
+        n_rows, n_cols = shape
+
+        if len(rows):
+            key = rows * max(n_cols, 1) + cols
+            order = np.argsort(key, kind='stable')
+            key, data = key[order], data[order]
+            starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+            data = np.add.reduceat(data, starts)
+            key = key[starts]
+            rows, cols = key // max(n_cols, 1), key % max(n_cols, 1)
+
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+        return cls(indptr, cols, data, shape)
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    def row_ids(self):
+        """每个非零元素所在的行号"""
+        if self._row_ids is None:
+            self._row_ids = np.repeat(np.arange(self.shape[0], dtype=np.int64), np.diff(self.indptr))
+        return self._row_ids
+
+    def row(self, i):
+        """返回第 i 行的 (列号, 值)"""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def astype(self, dtype):
+        return CSRMatrix(self.indptr, self.indices, self.data.astype(dtype), self.shape)
+
+    def binarize(self):
+        """所有非零值置为 1 (出现矩阵)"""
+        return CSRMatrix(self.indptr, self.indices, np.ones(self.nnz, dtype=np.int64), self.shape)
+
+    def transpose(self):
+        return CSRMatrix.from_coo(self.indices, self.row_ids(), self.data,
+                                  (self.shape[1], self.shape[0]), dtype=self.data.dtype)
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def select_rows(self, rows):
+        """按行号 (或布尔掩码) 取子矩阵，行数不变，未选中的行置空"""
+        keep = np.zeros(self.shape[0], dtype=bool)
+        keep[rows] = True
+        # 过滤不改变非零元素的相对顺序，直接重算 indptr 即可
+        mask = keep[self.row_ids()]
+        indptr = np.zeros(self.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.diff(self.indptr) * keep, out=indptr[1:])
+        return CSRMatrix(indptr, self.indices[mask], self.data[mask], self.shape)
+
+    def select_columns(self, cols):
+        """按列号取子矩阵，列按 cols 的顺序重新编号"""
+        cols = np.asarray(cols, dtype=np.int64)
+        remap = np.full(self.shape[1], -1, dtype=np.int64)
+        remap[cols] = np.arange(len(cols))
+        new_cols = remap[self.indices]
+        mask = new_cols >= 0
+        return CSRMatrix.from_coo(self.row_ids()[mask], new_cols[mask], self.data[mask],
+                                  (self.shape[0], len(cols)), dtype=self.data.dtype)
+
+    def sum(self, axis=None, row_weights=None):
+        """
+        求和；row_weights 为每行的权重 (如年份掩码)，相当于 w @ A
+        """
+        data = self.data if row_weights is None else self.data * np.asarray(row_weights)[self.row_ids()]
+        if axis is None:
+            return data.sum()
+        if axis == 0:
+            return np.bincount(self.indices, weights=data, minlength=self.shape[1]).astype(data.dtype)
+        return np.bincount(self.row_ids(), weights=data, minlength=self.shape[0]).astype(data.dtype)
+
+    def grouped_sum(self, row_groups, n_groups, row_mask=None):
+        """
+        按行分组求和，返回稠密的 (n_groups × 列数) 矩阵
+        等价于 分组指示矩阵 @ A；row_groups 为每行的组号，负数表示丢弃
+        """
+        groups = np.asarray(row_groups, dtype=np.int64)[self.row_ids()]
+        keep = groups >= 0
+        if row_mask is not None:
+            keep &= np.asarray(row_mask)[self.row_ids()]
+        flat = np.bincount(groups[keep] * self.shape[1] + self.indices[keep],
+                           weights=self.data[keep], minlength=n_groups * self.shape[1])
+        return flat.astype(self.data.dtype).reshape(n_groups, self.shape[1])
+
+    def matmul(self, other):
+        """
+        稀疏 × 稀疏 乘法 (SpGEMM)
+        对 A 的每个非零 (i, k)，展开 B 的第 k 行，再按 (i, j) 归并累加
+        """
+        a_rows = self.row_ids()
+        lengths = other.indptr[self.indices + 1] - other.indptr[self.indices]
+        total = int(lengths.sum())
+        out_rows = np.repeat(a_rows, lengths)
+        offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        b_pos = np.repeat(other.indptr[self.indices], lengths) + offsets
+        values = np.repeat(self.data, lengths) * other.data[b_pos]
+        return CSRMatrix.from_coo(out_rows, other.indices[b_pos], values,
+                                  (self.shape[0], other.shape[1]), dtype=values.dtype)
+
+    def __matmul__(self, other):
+        return self.matmul(other)
+
+    def to_dense(self):
+        dense = np.zeros(self.shape, dtype=self.data.dtype)
+        dense[self.row_ids(), self.indices] = self.data
+        return dense
@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from analysis import PaperAnalyzer
+from benchmark import make_corpus
+
+FIXTURE_CSV = os.path.join(os.path.dirname(__file__), 'fixtures', 'meta.csv')
+
+
+@pytest.fixture(scope='session')
+def synthetic_csv(tmp_path_factory):
+    path = tmp_path_factory.mktemp('corpus') / 'meta.csv'
+    make_corpus(2000, n_keywords=300, n_authors=800, abstract_words=5).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(scope='session', params=['fixture', 'synthetic'])
+def corpus(request, synthetic_csv):
+    """(analyzer, object-typed copy of the same rows) for comparing against the pandas references."""
+    path = FIXTURE_CSV if request.param == 'fixture' else synthetic_csv
+    df = PaperAnalyzer.load_data(path, verbose=False)
+    reference = df.astype({'keywords': object, 'authors': object}).fillna({'keywords': '', 'authors': ''})
+    return PaperAnalyzer(df), reference
@@ -0,0 +1,142 @@
+"""
+Regression tests for the vectorized PaperAnalyzer queries.
+
+Every query is compared with the explode/value_counts/groupby code it
+replaced (reimplemented below). Keywords with equal counts may come back
+in a different order, so rankings are compared by their counts and by the
+count of every returned keyword rather than position by position.
+"""
+import re
+
+import pandas as pd
+import pytest
+
+
+def explode(df, col_name):
+    """The original PaperAnalyzer._explode_column."""
+    exploded = df.copy()
+    exploded[col_name] = exploded[col_name].astype(str).str.replace(';', ',').str.replace('，', ',')
+    exploded = exploded.assign(**{col_name: exploded[col_name].str.split(',')}).explode(col_name)
+    exploded[col_name] = exploded[col_name].str.strip()
+    return exploded[exploded[col_name] != '']
+
+
+def subset(df, year=None, conference=None):
+    if year:
+        df = df[(df['year'] == year).fillna(False)]
+    if conference:
+        df = df[df['conference'].astype(object) == conference]
+    return df
+
+
+def reference_counts(df, col_name):
+    return explode(df, col_name)[col_name].value_counts()
+
+
+def assert_ranking(keywords, counts, expected):
+    """keywords/counts are a ranking of ``expected`` (a value_counts Series), ties in any order."""
+    assert list(counts) == list(expected.values[:len(counts)])
+    assert all(expected[k] == c for k, c in zip(keywords, counts))
+    assert len(set(keywords)) == len(keywords)
+
+
+def years_and_confs(reference):
+    years = sorted(reference['year'].dropna().unique().tolist())
+    confs = sorted(reference['conference'].astype(object).unique().tolist())
+    return years, confs
+
+
+def test_get_keyword_stats_matches_value_counts(corpus):
+    analyzer, reference = corpus
+    years, confs = years_and_confs(reference)
+    for year, conference in [(None, None), (years[-1], None), (None, confs[0]), (years[0], confs[-1])]:
+        stats, df_subset = analyzer.get_keyword_stats(year=year, conference=conference)
+        expected = reference_counts(subset(reference, year, conference), 'keywords')
+        assert len(df_subset) == len(subset(reference, year, conference))
+        assert dict(zip(stats['Keyword'], stats['Count'])) == expected.to_dict()
+        assert list(stats['Count']) == sorted(stats['Count'], reverse=True)
+
+
+def test_get_keyword_stats_limit(corpus):
+    analyzer, reference = corpus
+    stats, _ = analyzer.get_keyword_stats(limit=5)
+    assert len(stats) == 5
+    assert_ranking(stats['Keyword'].tolist(), stats['Count'].tolist(), reference_counts(reference, 'keywords'))
+
+
+def test_get_all_keywords_list_is_ranked_by_count(corpus):
+    analyzer, reference = corpus
+    expected = reference_counts(reference, 'keywords')
+    keywords = analyzer.get_all_keywords_list()
+    assert sorted(keywords) == sorted(expected.index)
+    assert_ranking(keywords, [expected[k] for k in keywords], expected)
+
+
+def test_get_all_authors_list(corpus):
+    analyzer, reference = corpus
+    assert analyzer.get_all_authors_list() == sorted(explode(reference, 'authors')['authors'].unique())
+
+
+def test_get_authors_by_keyword(corpus):
+    analyzer, reference = corpus
+    exploded = explode(reference, 'keywords')
+    keyword = exploded['keywords'].value_counts().index[0]
+    papers = reference.loc[exploded.index[exploded['keywords'] == keyword].unique()]
+    stats, relevant = analyzer.get_authors_by_keyword(keyword)
+    assert sorted(relevant.index) == sorted(papers.index)
+    expected = reference_counts(papers, 'authors')
+    assert dict(zip(stats['Author'], stats['Paper_Count'])) == expected.to_dict()
+
+
+@pytest.mark.parametrize('conference', [None, 'icse'])
+def test_get_keyword_trend_data_matches_groupby(corpus, conference):
+    analyzer, reference = corpus
+    df = subset(reference, conference=conference)
+    exploded = explode(df, 'keywords')
+
+    trend = analyzer.get_keyword_trend_data(conference=conference, top_n=5)
+    totals = trend.groupby('Keyword')['Count'].sum()
+    # Top-n selection counts papers without a year too, the per-year rows do not
+    all_years = reference_counts(df, 'keywords')
+    selected = sorted(totals.index, key=lambda kw: -all_years[kw])
+    assert_ranking(selected, [all_years[kw] for kw in selected], all_years)
+
+    exploded = exploded[exploded['keywords'].isin(totals.index)]
+    grouped = exploded.groupby(['year', 'keywords']).size()
+    pivot = grouped.unstack(fill_value=0)
+    expected = pivot.reset_index().melt(id_vars='year', var_name='Keyword', value_name='Count')
+    key = ['year', 'Keyword']
+    got = trend.astype({'year': int}).sort_values(key).reset_index(drop=True)
+    expected = expected.astype({'year': int}).sort_values(key).reset_index(drop=True)
+    pd.testing.assert_frame_equal(got[key + ['Count']], expected[key + ['Count']], check_dtype=False)
+
+
+def test_get_yearly_top_k_matrix(corpus):
+    analyzer, reference = corpus
+    k = 4
+    matrix = analyzer.get_yearly_top_k_matrix(k=k)
+    exploded = explode(reference, 'keywords').dropna(subset=['year'])
+    years = sorted(exploded['year'].unique(), reverse=True)
+    assert [int(y) for y in matrix.columns] == [int(y) for y in years]
+    assert list(matrix.index) == [f"Top {i + 1}" for i in range(k)]
+    for year in years:
+        expected = exploded[exploded['year'] == year]['keywords'].value_counts()
+        cells = [c for c in matrix[year] if c != '-']
+        parsed = [re.fullmatch(r'(.*) \((\d+)\)', c).groups() for c in cells]
+        assert len(cells) == min(k, len(expected))
+        assert_ranking([kw for kw, _ in parsed], [int(n) for _, n in parsed], expected)
+
+
+def test_get_author_keyword_details(corpus):
+    analyzer, reference = corpus
+    author = explode(reference, 'authors')['authors'].value_counts().index[0]
+    papers = analyzer.get_papers_by_author(author)
+    kw_counts, kw_trend = analyzer.get_author_keyword_details(papers)
+
+    exploded = explode(reference.loc[papers.index], 'keywords')
+    expected_counts = exploded['keywords'].value_counts()
+    assert dict(zip(kw_counts['Keyword'], kw_counts['Count'])) == expected_counts.to_dict()
+    expected_trend = exploded.groupby(['year', 'keywords']).size()
+    got = kw_trend.set_index(['year', 'Keyword'])['Count_Year']
+    assert {(int(y), kw): n for (y, kw), n in got.items()} == \
+        {(int(y), kw): n for (y, kw), n in expected_trend.items()}
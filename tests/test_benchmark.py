@@ -0,0 +1,42 @@
+import json
+
+from click.testing import CliRunner
+
+from benchmark import main
+
+REPORT_KEYS = {'revision', 'timestamp', 'python', 'numpy', 'pandas', 'platform', 'repeat',
+               'abstract_words', 'results'}
+RESULT_KEYS = {'size', 'group', 'name', 'seconds', 'peak_bytes'}
+
+
+def run_benchmark(tmp_path, *args):
+    output = tmp_path / 'results.json'
+    result = CliRunner().invoke(main, ['--sizes', '300', '--repeat', '1', '--abstract-words', '5',
+                                       '--output', str(output), *args])
+    assert result.exit_code == 0, result.output
+    return result.output, json.loads(output.read_text(encoding='utf-8'))
+
+
+def test_benchmark_smoke_and_schema(tmp_path):
+    output, report = run_benchmark(tmp_path)
+    assert set(report) == REPORT_KEYS
+    assert report['repeat'] == 1
+    results = report['results']
+    assert results and all(set(r) == RESULT_KEYS for r in results)
+    assert {r['group'] for r in results} == {'data', 'load', 'build', 'query'}
+    assert all(r['size'] == 300 and r['seconds'] >= 0 for r in results)
+    assert all(isinstance(r['peak_bytes'], int) and r['peak_bytes'] >= 0 for r in results)
+    # Every public analyzer query is covered
+    assert 'not benchmarked' not in output
+    names = {r['name'] for r in results}
+    assert {'read_papers_from_csv', 'save_papers_to_csv', 'load_data', 'get_keyword_stats'} <= names
+
+
+def test_benchmark_compare(tmp_path):
+    _, baseline = run_benchmark(tmp_path, '--no-memory')
+    assert all(r['peak_bytes'] is None for r in baseline['results'])
+    baseline_path = tmp_path / 'baseline.json'
+    baseline_path.write_text(json.dumps(baseline), encoding='utf-8')
+    output, _ = run_benchmark(tmp_path, '--no-memory', '--compare', str(baseline_path))
+    assert f"compared with {baseline_path}" in output
+    assert 'get_keyword_stats' in output.split('compared with')[1]
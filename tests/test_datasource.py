@@ -0,0 +1,83 @@
+import io
+
+import pandas as pd
+
+from data import PaperRecord, append_papers_to_csv, save_papers_to_csv
+from datasource import DataSource, scan_records
+
+
+def paper(paper_id):
+    return PaperRecord(id=paper_id, conference='icse', year='2024', title=f"Paper {paper_id}",
+                       authors='Alice Zhang', abstract='', keyword='Fuzzing')
+
+
+def test_out_of_order_append_is_loaded(tmp_path):
+    # With --workers > 1 the pipeline appends papers in the order tagging finishes
+    path = str(tmp_path / 'meta.csv')
+    append_papers_to_csv(path, [paper(i) for i in (1, 2, 3, 5)])
+    source = DataSource(path)
+    assert sorted(source.refresh().raw_df['id']) == [1, 2, 3, 5]
+
+    append_papers_to_csv(path, [paper(4)])
+    assert sorted(source.refresh().raw_df['id']) == [1, 2, 3, 4, 5]
+    assert sorted(DataSource(path).refresh().raw_df['id']) == [1, 2, 3, 4, 5]
+
+
+def test_already_loaded_ids_are_not_duplicated(tmp_path):
+    path = str(tmp_path / 'meta.csv')
+    append_papers_to_csv(path, [paper(1), paper(2)])
+    source = DataSource(path)
+    source.refresh()
+    append_papers_to_csv(path, [paper(2), paper(3)])
+    assert sorted(source.refresh().raw_df['id']) == [1, 2, 3]
+
+
+def test_abstracts_are_read_from_disk_on_demand(tmp_path):
+    path = str(tmp_path / 'meta.csv')
+    papers = [paper(i) for i in (1, 2, 3)]
+    papers[0].abstract = 'Multi-line abstract,\nwith "quotes" and commas.'
+    papers[2].abstract = '变异测试的摘要'
+    append_papers_to_csv(path, papers)
+    source = DataSource(path)
+    analyzer = source.refresh()
+    assert 'abstract' not in analyzer.raw_df.columns
+    details = analyzer.get_paper_details([2, 0])
+    assert details['abstract'].tolist() == [papers[2].abstract, papers[0].abstract]
+    assert list(analyzer.search_papers('quotes')['id']) == [1]
+
+    append_papers_to_csv(path, [PaperRecord(id=4, conference='icse', year='2024', title='Paper 4',
+                                            authors='Bob Li', abstract='Appended "abstract"\nhere.')])
+    analyzer = source.refresh()
+    assert analyzer.get_paper_details([3])['abstract'].tolist() == ['Appended "abstract"\nhere.']
+    assert list(analyzer.search_papers('appended')['id']) == [4]
+
+
+def test_rewrite_with_an_edited_abstract_rebuilds(tmp_path):
+    path = str(tmp_path / 'meta.csv')
+    papers = [paper(i) for i in (1, 2)]
+    save_papers_to_csv(path, papers)
+    source = DataSource(path)
+    source.refresh()
+
+    papers[0].keyword = 'Fuzzing,Grammar'
+    papers[1].abstract = 'Symbolic execution.'
+    save_papers_to_csv(path, papers + [paper(3)])
+    analyzer = source.refresh()
+    assert list(analyzer.search_papers('symbolic')['id']) == [2]
+    assert analyzer.get_paper_details([1, 2])['abstract'].tolist() == ['Symbolic execution.', '']
+    assert 'Grammar' in analyzer.get_all_keywords_list()
+
+
+def test_scan_records_matches_pandas(tmp_path):
+    # Quoted newlines and escaped quotes stay inside a record, blank lines are skipped
+    path = tmp_path / 'meta.csv'
+    path.write_bytes(b'id,abstract\r\n1,"a\r\nb"\r\n\r\n2,""""\r\n\n3,x\r\n4,"tail')
+    size = path.stat().st_size
+    with open(path, 'rb') as f:
+        starts, ends = scan_records(f, 0, size)
+        assert len(scan_records(f, 0, size, final=True)[0]) == len(starts) + 1
+        f.seek(0)
+        complete = f.read(ends[-1])
+    df = pd.read_csv(io.BytesIO(complete))
+    assert len(starts) == len(df) + 1
+    assert df['abstract'].tolist() == ['a\r\nb', '"', 'x']
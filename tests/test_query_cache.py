@@ -0,0 +1,32 @@
+import numpy as np
+
+from query_cache import CachedAnalyzer, QueryCache, estimate_size, make_key
+
+
+def test_frame_arguments_are_keyed_by_index(corpus):
+    analyzer, _ = corpus
+    df = analyzer.raw_df
+    # df_scope only selects papers, so frames over the same rows share a key
+    assert make_key(df) == make_key(df[['title']])
+    assert make_key(df.iloc[:5]) != make_key(df.iloc[5:10])
+    assert make_key(df.iloc[:5]) != make_key(df.iloc[:6])
+    assert make_key(np.arange(3)) != make_key(np.arange(3, dtype=np.int32))
+
+
+def test_cached_scope_query_and_shared_frame_size(corpus):
+    analyzer, _ = corpus
+    cache = QueryCache()
+    cached = CachedAnalyzer(analyzer, cache, version=1)
+    stats, df_subset = cached.get_keyword_stats()
+    # The unfiltered subset is raw_df itself and is not charged to the budget
+    assert df_subset is analyzer.raw_df
+    assert cache.total_bytes == estimate_size((stats, df_subset), shared=(df_subset,))
+    assert cache.total_bytes < estimate_size(analyzer.raw_df)
+
+    keyword = analyzer.get_all_keywords_list()[0]
+    _, scope = analyzer.get_keyword_stats(year=int(analyzer.raw_df['year'].max()))
+    first = cached.get_papers_by_keyword_strict(keyword, df_scope=scope)
+    hits = cache.hits
+    assert cached.get_papers_by_keyword_strict(keyword, df_scope=scope.copy()) is first
+    assert cache.hits == hits + 1
+    assert first.index.isin(scope.index).all()
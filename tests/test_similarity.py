@@ -0,0 +1,32 @@
+import pandas as pd
+
+from analysis import PaperAnalyzer
+from similarity import SimilarityIndex
+
+
+def untokenized_corpus():
+    # "On It" is all stopwords / short tokens and the modal fetch left the abstract empty
+    return pd.DataFrame({
+        'id': [1, 2, 3],
+        'conference': ['icse'] * 3,
+        'year': [2024] * 3,
+        'title': ['On It', 'Fuzzing Compilers with Grammars', 'Grammar Based Fuzzing'],
+        'authors': ['Alice Zhang', 'Bob Li', 'Carol Wu'],
+        'abstract': ['', 'We fuzz compilers.', 'Grammars guide fuzzing.'],
+        'keywords': ['', 'Fuzzing', 'Fuzzing,Grammar'],
+    })
+
+
+def test_related_papers_of_a_paper_without_tokens():
+    analyzer = PaperAnalyzer(untokenized_corpus())
+    assert analyzer.get_related_papers(0).empty
+    related = analyzer.get_related_papers(1)
+    assert list(related['id']) == [3]
+
+
+def test_all_neighbors_with_an_untokenized_paper():
+    analyzer = PaperAnalyzer(untokenized_corpus())
+    index = SimilarityIndex.from_search_index(analyzer._search_index(), analyzer.kw_incidence)
+    neighbors, scores = index.all_neighbors(top_k=2)
+    assert (neighbors[0] == -1).all() and (scores[0] == 0).all()
+    assert neighbors[1, 0] == 2 and neighbors[2, 0] == 1
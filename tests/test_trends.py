@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from analysis import PaperAnalyzer
+from tests.conftest import FIXTURE_CSV
+from trends import trend_scores
+
+
+@pytest.mark.parametrize('years', [[2020, 2021], [2016, 2019, 2020, 2024]])
+def test_slope_matches_polyfit(years):
+    rng = np.random.default_rng(0)
+    papers = rng.integers(50, 200, size=len(years))
+    counts = rng.integers(0, 50, size=(len(years), 6))
+    slope = trend_scores(counts, papers, years=years)['slope']
+    expected = [np.polyfit(years, counts[:, j] / papers, 1)[0] * 100 for j in range(counts.shape[1])]
+    np.testing.assert_allclose(slope, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_growth_sign_follows_counts_when_latest_year_is_small():
+    # The latest year is only partly crawled: a keyword dropping to zero must not show growth
+    scores = trend_scores([[3, 1], [2, 1], [0, 5]], [900, 1000, 200])
+    assert scores['growth'][0] < 0
+    assert scores['growth'][1] > 0
+
+
+def test_rising_and_declining_keywords_are_disjoint():
+    analyzer = PaperAnalyzer(PaperAnalyzer.load_data(FIXTURE_CSV, verbose=False))
+    for sort_by in ['burst', 'z_score', 'growth', 'slope']:
+        rising = analyzer.get_emerging_keywords(min_count=1, sort_by=sort_by)
+        declining = analyzer.get_emerging_keywords(min_count=1, sort_by=sort_by, direction='declining')
+        column = {'burst': 'Burst', 'z_score': 'Z_Score', 'growth': 'Growth', 'slope': 'Slope'}[sort_by]
+        assert (rising[column] >= 0).all() and (declining[column] <= 0).all()
+        assert not set(rising['Keyword']) & set(declining['Keyword'])
@@ -0,0 +1,66 @@
+import numpy as np
+
+
+# 基线占比的上下界，避免二项检验的标准差为 0
+RATE_EPS = 1e-6
+
+
+def trend_scores(counts, papers, window=2, smoothing=1.0, years=None):
+    """
+    对所有关键词一次性计算趋势指标 (全部是整矩阵运算，不按关键词循环)
+
+    counts: 年份 × 关键词 频次矩阵，最后一行为目标年份
+    papers: 每年的论文数，用于把频次换算为占比，消除会议规模变化的影响
+    window: 近期窗口的年数 (含目标年份)，其余年份作为基线
+    years: 每行对应的实际年份 (可以不连续)，用于计算斜率；默认按行号
+
+    返回 dict，每项都是长度为关键词数的数组：
+    - count / prev_count: 目标年份与上一年的频次
+    - growth: 占比的同比增长率 (加 smoothing 平滑，避免 0 → 1 被算成无穷大)
+    - z_score: 目标年份占比相对基线各年占比均值 / 标准差的偏离
+    - burst: 近期窗口占比相对基线占比的二项检验 z 值，频次越多越可信
+    - slope: 占比对实际年份的最小二乘斜率 (每年变化的百分点)
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    papers = np.maximum(np.asarray(papers, dtype=np.float64), 1)
+    n_years = counts.shape[0]
+    share = counts / papers[:, None]
+
+    count = counts[-1]
+    prev_count = counts[-2] if n_years > 1 else np.zeros_like(count)
+    prev_share = share[-2] if n_years > 1 else np.zeros_like(count)
+    # 两侧加同一个伪占比：若按各自年份的论文数换算，目标年份论文较少 (如尚未采集完) 时
+    # 频次下降的关键词也会显示为正增长
+    smooth = smoothing / papers[-2:].mean()
+    growth = (share[-1] + smooth) / (prev_share + smooth) - 1
+
+    window = min(max(window, 1), n_years - 1) if n_years > 1 else 1
+    baseline, recent = share[:n_years - window], slice(n_years - window, n_years)
+    if len(baseline) >= 2:
+        mean, std = baseline.mean(axis=0), baseline.std(axis=0)
+        # 标准差取一个下限，否则基线恒为 0 的新词 z 值会无穷大
+        z_score = (share[-1] - mean) / np.maximum(std, 1 / papers.mean())
+    else:
+        z_score = np.zeros_like(count)
+
+    base_papers = papers[:n_years - window].sum()
+    recent_papers = papers[recent].sum()
+    base_rate = (counts[:n_years - window].sum(axis=0) + smoothing) / (base_papers + 2 * smoothing)
+    # 同一篇论文重复标注同一关键词时频次可能超过论文数，占比会达到 1
+    base_rate = np.clip(base_rate, RATE_EPS, 1 - RATE_EPS)
+    recent_rate = counts[recent].sum(axis=0) / recent_papers
+    burst = (recent_rate - base_rate) / np.sqrt(base_rate * (1 - base_rate) / recent_papers)
+
+    years = np.arange(n_years, dtype=np.float64) if years is None else np.asarray(years, dtype=np.float64)
+    centered = years - years.mean()
+    ss = (centered ** 2).sum()
+    slope = centered @ (share - share.mean(axis=0)) / (ss if ss > 0 else 1) * 100
+
+    return {
+        'count': count.astype(np.int64),
+        'prev_count': prev_count.astype(np.int64),
+        'growth': growth,
+        'z_score': z_score,
+        'burst': burst,
+        'slope': slope,
+    }